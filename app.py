@@ -1,439 +1,1995 @@
 import math
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, Response
 import threading
 import json
 import datetime
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from bs4 import BeautifulSoup
 from binance.client import Client
+from binance.exceptions import BinanceAPIException
+import requests
+from requests.adapters import HTTPAdapter
+import redis
 import time
 import re
+import os
+import socket
+import uuid
+import decimal
+import bisect
+import hashlib
+import queue
+import zlib
 import logging
+from collections import namedtuple, deque
+from contextlib import contextmanager
+import psutil
 
 app = Flask(__name__)
 running_scrapers = {}
+trader_scrapers = {}
+scrapers_lock = threading.Lock()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-class ScrapeTask:
-    def __init__(self, task_id, link, api_key, api_secret, leverage, trader_portfolio_size, your_portfolio_size):
-        self.link = link
-        self.task_id = task_id
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+LAG_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 90.0, 120.0, 180.0, float('inf'))
+SCRAPE_STAGES = ('page_load', 'dom_fetch', 'parse', 'dedup')
+ORDER_STAGES = ('sizing', 'futures_create_order', 'futures_place_batch_order')
+STAGES = SCRAPE_STAGES + ORDER_STAGES
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def snapshot(self):
+        with self.lock:
+            return list(self.counts), self.sum, self.count
+
+
+class TaskMetrics:
+    def __init__(self, stages=STAGES):
+        self.stages = {stage: Histogram() for stage in stages}
+        self.detection_lag = Histogram(LAG_BUCKETS)
+        self.copy_lag = Histogram(LAG_BUCKETS)
+
+    def timer(self, stage):
+        return self.stages[stage].time()
+
+    def observe(self, stage, value):
+        self.stages[stage].observe(value)
+
+
+def metric_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_histogram(lines, name, labels, histogram):
+    counts, total, count = histogram.snapshot()
+    cumulative = 0
+    for bound, bucket_count in zip(histogram.buckets, counts):
+        cumulative += bucket_count
+        le = '+Inf' if bound == float('inf') else repr(bound)
+        lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+    lines.append(f'{name}_sum{{{labels}}} {total}')
+    lines.append(f'{name}_count{{{labels}}} {count}')
+
+
+EXCHANGE_INFO_TTL = int(os.environ.get('EXCHANGE_INFO_TTL', 3600))
+EXCHANGE_INFO_MIN_REFRESH = int(os.environ.get('EXCHANGE_INFO_MIN_REFRESH', 60))
+
+SymbolFilters = namedtuple('SymbolFilters', ['step_size', 'precision', 'min_quantity'])
+
+
+class ExchangeInfoCache:
+    def __init__(self, ttl=EXCHANGE_INFO_TTL, min_refresh=EXCHANGE_INFO_MIN_REFRESH):
+        self.ttl = ttl
+        self.min_refresh = min_refresh
+        self.client = None
+        self.symbols = {}
+        self.loaded_at = None
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.refresh_thread = None
+
+    def start(self, client):
+        with self.lock:
+            if self.client is None:
+                self.client = client
+            if self.loaded_at is None:
+                self.refresh()
+            if self.refresh_thread is None:
+                self.refresh_thread = threading.Thread(target=self.refresh_loop, daemon=True)
+                self.refresh_thread.start()
+
+    def refresh(self):
+        try:
+            exchange_info = self.client.futures_exchange_info()
+        except Exception as e:
+            logging.info(f"Error loading exchange info: {e}")
+            return False
+        symbols = {}
+        for symbol_info in exchange_info['symbols']:
+            filters = self.compile_filters(symbol_info)
+            if filters:
+                symbols[symbol_info['symbol']] = filters
+        self.symbols = symbols
+        self.loaded_at = time.time()
+        logging.info(f"Exchange info loaded: {len(symbols)} symbols.")
+        return True
+
+    def refresh_loop(self):
+        while True:
+            self.wake.wait(self.ttl)
+            self.wake.clear()
+            self.refresh()
+            time.sleep(self.min_refresh)
+
+    @staticmethod
+    def compile_filters(symbol_info):
+        # Futures filters: LOT_SIZE gives the step, and the larger of the LOT_SIZE and MARKET_LOT_SIZE
+        # minimums is the smallest market order.
+        step_size = None
+        min_quantity = 0.0
+        for f in symbol_info['filters']:
+            if f['filterType'] == 'LOT_SIZE':
+                step_size = float(f['stepSize'])
+            if f['filterType'] in ('LOT_SIZE', 'MARKET_LOT_SIZE'):
+                min_quantity = max(min_quantity, float(f.get('minQty', 0)))
+        if not step_size:
+            return None
+        precision = int(round(-math.log(step_size, 10)))
+        return SymbolFilters(step_size, precision, min_quantity)
+
+    def get(self, symbol):
+        # Sizing never waits on the network: an unknown symbol returns None and wakes the refresh thread,
+        # so a new listing is picked up on the next refresh.
+        filters = self.symbols.get(symbol)
+        if filters is None:
+            self.wake.set()
+        return filters
+
+
+exchange_info_cache = ExchangeInfoCache()
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+TRADE_ROWS_SELECTOR = ".css-g5h8k8 > div > div > div > table > tbody > tr"
+TRADE_ROWS_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0]), function (row) {
+    return Array.from(row.cells, function (cell) { return cell.textContent.trim(); });
+});
+"""
+
+
+def parse_trade_rows_html(html):
+    soup = BeautifulSoup(html, HTML_PARSER)
+    return [[td.get_text().strip() for td in row.find_all('td', recursive=False)]
+            for row in soup.select(TRADE_ROWS_SELECTOR)]
+
+
+PAGE_WAIT_TIMEOUT = float(os.environ.get('PAGE_WAIT_TIMEOUT', 10))
+PAGE_POLL_FREQUENCY = float(os.environ.get('PAGE_POLL_FREQUENCY', 0.1))
+PAGE_OBSERVER = os.environ.get('PAGE_OBSERVER', '0') == '1'
+# Seconds between full page reloads. Keep it well under the 2 minute acceptance window, since the cheap
+# refresh on page 1 may not refetch the table.
+FULL_RELOAD_INTERVAL = float(os.environ.get('FULL_RELOAD_INTERVAL', 60))
+NAVIGATE_ATTEMPTS = int(os.environ.get('NAVIGATE_ATTEMPTS', 5))
+FIRST_PAGE_XPATH = "//*[contains(@class, 'bn-pagination-item')][normalize-space()='1']"
+
+FIRST_ROW_SCRIPT = """
+var row = document.querySelector(arguments[0]);
+return row ? row.textContent : null;
+"""
+TRADE_ROWS_OBSERVER_SCRIPT = """
+var row = document.querySelector(arguments[0]);
+if (!row) return false;
+if (window.__tradeRowsObserver) window.__tradeRowsObserver.disconnect();
+window.__tradeRowsVersion = window.__tradeRowsVersion || 0;
+window.__tradeRowsObserver = new MutationObserver(function () { window.__tradeRowsVersion += 1; });
+window.__tradeRowsObserver.observe(row.closest('table') || row.parentNode, {childList: true, subtree: true, characterData: true});
+return true;
+"""
+
+BROWSER_POOL_SIZE = int(os.environ.get('BROWSER_POOL_SIZE', 2))
+BROWSER_MAX_PAGE_LOADS = int(os.environ.get('BROWSER_MAX_PAGE_LOADS', 500))
+BROWSER_MAX_RSS_MB = int(os.environ.get('BROWSER_MAX_RSS_MB', 1024))
+BROWSER_MAX_CYCLES = int(os.environ.get('BROWSER_MAX_CYCLES', 2000))
+BROWSER_RSS_INTERVAL = float(os.environ.get('BROWSER_RSS_INTERVAL', 30))
+
+
+class BrowserSlot:
+    def __init__(self, index):
+        self.index = index
         self.driver = None
-        self.binance_client = None
-        self.processed_orders = set()
-        self.current_page = 1
-        self.current_time = None
-        self.all_orders = []
-        self.timer = None
-        self.running = False
-        self.leverage = leverage
-        self.trader_portfolio_size = trader_portfolio_size
-        self.your_portfolio_size = your_portfolio_size
-        self.close_only_mode = False
-        self.reverse_copy = False
-        self.api_key = api_key
-        self.api_secret = api_secret
-        self.min_order_quantity = {}
-        self.initialize_binance_client()
-        
-    def stop(self):
-        if self.running:
-            self.running = False
-            if self.driver:
+        self.generation = 0
+        self.page_loads = 0
+        self.cycles = 0
+        self.recycles = 0
+        self.failing = set()
+        self.rss_checked_at = 0.0
+        self.tabs = 0
+        self.cookies_accepted = False
+        self.busy = False
+        self.turns = deque()
+        self.condition = threading.Condition()
+
+    @contextmanager
+    def lease(self, start=True):
+        # Tasks sharing this browser take turns in arrival order, so a busy tab cannot starve the others.
+        turn = object()
+        with self.condition:
+            self.turns.append(turn)
+            while self.busy or self.turns[0] is not turn:
+                self.condition.wait()
+            self.turns.popleft()
+            self.busy = True
+        try:
+            if start and not self.driver:
+                self.start_driver()
+            yield self.driver
+        finally:
+            try:
+                self.recycle_if_needed()
+            finally:
+                with self.condition:
+                    self.busy = False
+                    self.condition.notify_all()
+
+    def start_driver(self):
+        chrome_options = Options()
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        self.driver = webdriver.Chrome(options=chrome_options)
+        self.generation += 1
+        self.page_loads = 0
+        self.cycles = 0
+        self.failing = set()
+        self.cookies_accepted = False
+        logging.info(f"WebDriver initialized in pool slot {self.index}.")
+
+    def quit_driver(self):
+        if self.driver:
+            try:
                 self.driver.quit()
-            if self.timer:
-                self.timer.cancel()
-            logging.info(f"Scraper {self.task_id} stopped.")
-        else:
-            logging.info(f"Scraper {self.task_id} is not running.")
+            except Exception as e:
+                logging.info(f"Error quitting WebDriver in pool slot {self.index}: {e}")
+            self.driver = None
 
-    def initialize_driver(self):
+    def rss_mb(self):
         try:
-            if not self.driver:  # Перевірка на наявність вебдрайвера
-                chrome_options = Options()
-                chrome_options.add_argument("--no-sandbox")
-                chrome_options.add_argument("--headless")
-                chrome_options.add_argument("--disable-gpu")
-                chrome_options.add_argument("--disable-extensions")
-                chrome_options.add_argument("--disable-dev-shm-usage")
-                self.driver = webdriver.Chrome(options=chrome_options)
-                self.driver.get(self.link)
-                logging.info("WebDriver initialized.")
-        except Exception as e:
-            logging.info(f"Error initializing WebDriver: {e}")
-            self.running = False
+            process = psutil.Process(self.driver.service.process.pid)
+            processes = [process] + process.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except Exception:
+            return 0.0
 
-    def initialize_binance_client(self):
+    def record_cycle(self, tab):
+        with self.condition:
+            self.cycles += 1
+            self.failing.discard(tab)
+
+    def record_failure(self, tab):
+        # The browser is only suspect once every tab on it has failed since its last healthy cycle, so one
+        # trader's broken page doesn't restart the browser under the others.
+        with self.condition:
+            self.failing.add(tab)
+            return len(self.failing) >= self.tabs
+
+    def forget(self, tab):
+        with self.condition:
+            self.failing.discard(tab)
+
+    def recycle_if_needed(self):
+        if not self.driver:
+            return
+        # Cycles are counted across all tabs, so the limit scales with the tabs sharing this browser.
+        if self.page_loads >= BROWSER_MAX_PAGE_LOADS or self.cycles >= BROWSER_MAX_CYCLES * max(self.tabs, 1):
+            self.recycle()
+            return
+        # Measuring RSS walks every process on the host, so it is sampled rather than checked on each lease.
+        now = time.monotonic()
+        if now - self.rss_checked_at < BROWSER_RSS_INTERVAL:
+            return
+        self.rss_checked_at = now
+        if self.rss_mb() >= BROWSER_MAX_RSS_MB:
+            self.recycle()
+
+    def recycle(self):
+        logging.info(f"Recycling WebDriver in pool slot {self.index} after {self.page_loads} page loads "
+                     f"and {self.cycles} cycles.")
+        self.recycles += 1
+        self.quit_driver()
+
+
+class BrowserPool:
+    def __init__(self, size=BROWSER_POOL_SIZE):
+        self.slots = [BrowserSlot(index) for index in range(size)]
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            slot = min(self.slots, key=lambda s: s.tabs)
+            slot.tabs += 1
+            return slot
+
+    def release(self, slot):
+        with self.lock:
+            slot.tabs -= 1
+            idle = slot.tabs == 0
+        if idle:
+            with slot.lease(start=False):
+                slot.quit_driver()
+
+
+browser_pool = BrowserPool()
+
+
+class SeleniumSource:
+    def __init__(self, link, pool=browser_pool, observer=PAGE_OBSERVER):
+        self.link = link
+        self.pool = pool
+        self.observer = observer
+        self.last_reload = 0.0
+        self.slot = None
+        self.driver = None
+        self.handle = None
+        self.generation = None
+        self.navigated = False
+        self.current_page = 1
+
+    @property
+    def pool_slot(self):
+        return self.slot.index if self.slot else None
+
+    @property
+    def browser_recycles(self):
+        return self.slot.recycles if self.slot else 0
+
+    def rss_mb(self):
+        return self.slot.rss_mb() if self.slot and self.slot.driver else 0.0
+
+    def record_cycle(self):
+        if self.slot:
+            self.slot.record_cycle(self)
+
+    def recycle(self):
+        # Quit the slot's browser once every tab on it is failing; each tab then reopens in a fresh one on next use.
+        if self.slot and self.slot.record_failure(self):
+            with self.slot.lease(start=False):
+                if self.slot.driver:
+                    self.slot.recycle()
+
+    def open(self):
+        self.slot = self.pool.acquire()
+        with self.tab():
+            pass
+
+    def close(self):
+        if not self.slot:
+            return
         try:
-            self.binance_client = Client(self.api_key, self.api_secret)
-            logging.info("Binance client initialized.")
+            with self.tab(reopen=False) as driver:
+                if driver and self.handle in driver.window_handles:
+                    driver.close()
+                    driver.switch_to.window(driver.window_handles[0])
         except Exception as e:
-            logging.info(f"Error initializing Binance client: {e}")
-            self.running = False
+            logging.info(f"Error closing tab: {e}")
+        self.slot.forget(self)
+        self.pool.release(self.slot)
+        self.slot = None
+        self.driver = None
+        self.handle = None
 
-    def start_scraping(self, close_only_mode=False, reverse_copy=False):
-        self.close_only_mode = close_only_mode
-        self.reverse_copy = reverse_copy
-        if not self.driver:
-            self.initialize_driver()
-            self.accept_cookies()
+    @contextmanager
+    def tab(self, reopen=True):
+        if reopen and not self.ready():
+            self.prepare_tab()
+        with self.slot.lease(start=reopen) as driver:
+            self.driver = driver
+            if not driver:
+                self.handle = None
+            elif self.generation != self.slot.generation:
+                if reopen:
+                    # Recycled since prepare_tab: one attempt here, the retries are left to the next call.
+                    self.switch_to_tab()
+                else:
+                    self.handle = None
+            elif self.handle:
+                driver.switch_to.window(self.handle)
+            yield driver
+
+    def ready(self):
+        return self.slot.driver is not None and self.generation == self.slot.generation and self.navigated
+
+    def prepare_tab(self):
+        # One navigation attempt per lease, with the backoff spent outside it, so a slow page doesn't stall the
+        # other tabs on this browser. After NAVIGATE_ATTEMPTS the error goes up to the task supervisor.
+        delay = PAGE_POLL_FREQUENCY
+        for attempt in range(1, NAVIGATE_ATTEMPTS + 1):
+            try:
+                with self.slot.lease() as driver:
+                    self.driver = driver
+                    self.switch_to_tab()
+                return
+            except Exception as e:
+                print(f"Trade history tab not ready: {e}")
+                if attempt == NAVIGATE_ATTEMPTS:
+                    raise
+                time.sleep(delay)
+                delay *= 2
+
+    def switch_to_tab(self):
+        if self.generation != self.slot.generation:
+            self.open_tab()
+        else:
+            self.driver.switch_to.window(self.handle)
+        if not self.navigated:
             self.navigate_to_trade_history()
 
-        self.running = True
-        self.scrape_and_display_orders()
+    def open_tab(self):
+        self.driver.switch_to.new_window('tab')
+        self.handle = self.driver.current_window_handle
+        self.generation = self.slot.generation
+        self.navigated = False
+        self.driver.get(self.link)
+        self.slot.page_loads += 1
+        self.last_reload = time.monotonic()
+        if not self.slot.cookies_accepted:
+            self.accept_cookies()
+            self.slot.cookies_accepted = True
+        self.current_page = 1
+        logging.info(f"Opened trade history tab in pool slot {self.slot.index}.")
 
     def accept_cookies(self):
         try:
-            time.sleep(2)
-            accept_btn = self.find_element_with_retry(By.ID, "onetrust-accept-btn-handler")
+            accept_btn = WebDriverWait(self.driver, PAGE_WAIT_TIMEOUT, poll_frequency=PAGE_POLL_FREQUENCY).until(
+                EC.element_to_be_clickable((By.ID, "onetrust-accept-btn-handler")))
             accept_btn.click()
+            WebDriverWait(self.driver, PAGE_WAIT_TIMEOUT, poll_frequency=PAGE_POLL_FREQUENCY).until(
+                EC.invisibility_of_element_located((By.ID, "onetrust-accept-btn-handler")))
             print("Accepted cookies.")
-            time.sleep(2)
         except Exception as e:
             print(f"Error accepting cookies: {e}")
 
     def navigate_to_trade_history(self):
+        # A single attempt; on failure the page is refreshed for the next one and tab() retries outside the lease.
+        self.navigated = False
         try:
-            move_to_trade_history = self.find_element_with_retry(By.CSS_SELECTOR, "#tab-tradeHistory > div")
+            move_to_trade_history = WebDriverWait(self.driver, PAGE_WAIT_TIMEOUT, poll_frequency=PAGE_POLL_FREQUENCY).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, "#tab-tradeHistory > div")))
             self.driver.execute_script("arguments[0].scrollIntoView(true);", move_to_trade_history)
             move_to_trade_history.click()
-            print("Navigated to trade history tab.")
-            time.sleep(2)
+            self.wait_for_rows()
         except Exception as e:
             print(f"Trade history tab not found: {e}")
             self.driver.refresh()
+            self.slot.page_loads += 1
             print("Page refreshed.")
+            raise
+        print("Navigated to trade history tab.")
+        self.install_observer()
+        self.navigated = True
+
+    def install_observer(self):
+        # Re-run whenever the table may have been re-rendered: the old observer would be watching detached nodes.
+        if self.observer:
+            self.driver.execute_script(TRADE_ROWS_OBSERVER_SCRIPT, TRADE_ROWS_SELECTOR)
+
+    def wait_for_rows(self):
+        WebDriverWait(self.driver, PAGE_WAIT_TIMEOUT, poll_frequency=PAGE_POLL_FREQUENCY).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, TRADE_ROWS_SELECTOR)))
+
+    def table_state(self):
+        if self.observer:
+            return self.driver.execute_script("return window.__tradeRowsVersion || 0;")
+        return self.driver.execute_script(FIRST_ROW_SCRIPT, TRADE_ROWS_SELECTOR)
+
+    def wait_for_table_change(self, state):
+        try:
+            WebDriverWait(self.driver, PAGE_WAIT_TIMEOUT, poll_frequency=PAGE_POLL_FREQUENCY).until(
+                lambda driver: self.table_state() != state)
+            return True
+        except TimeoutException:
+            logging.info("Trade history table did not change before timeout.")
+            return False
+
+    def wait_for_change(self, timeout):
+        if not self.observer:
+            time.sleep(timeout)
+            return False
+        with self.tab():
+            state = self.table_state()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            time.sleep(PAGE_POLL_FREQUENCY)
+            with self.tab():
+                if self.table_state() != state:
+                    return True
+        return False
+
+    def fetch_rows(self):
+        with self.tab():
+            return self.extract_trade_rows()
+
+    def extract_trade_rows(self):
+        try:
+            rows = self.driver.execute_script(TRADE_ROWS_SCRIPT, TRADE_ROWS_SELECTOR)
+            if rows is not None:
+                return rows
+        except Exception as e:
+            logging.info(f"Error extracting trade rows with script, parsing page source: {e}")
+        return parse_trade_rows_html(self.driver.page_source)
+
+    def next_page(self):
+        with self.tab():
+            return self.click_next_page()
+
+    def click_next_page(self):
+        state = self.table_state()
+        next_page_button = self.find_element_with_retry(By.CSS_SELECTOR, "div.bn-pagination-next")
+        self.driver.execute_script("arguments[0].scrollIntoView(true);", next_page_button)
+        next_page_button.click()
+        self.slot.page_loads += 1
+        if not self.wait_for_table_change(state):
+            return False
+        print("Navigated to next page.")
+        self.current_page += 1
+        return True
+
+    def refresh(self):
+        with self.tab():
+            if time.monotonic() - self.last_reload >= FULL_RELOAD_INTERVAL or not self.refresh_table():
+                self.go_to_first_page()
+
+    def refresh_table(self):
+        # Cheap alternative to a full reload: jump back to page 1 in the pager, or re-open the
+        # trade history tab so the table is fetched again.
+        try:
+            state = self.table_state()
+            if self.current_page != 1:
+                first_page_button = self.find_element_with_retry(By.XPATH, FIRST_PAGE_XPATH)
+                first_page_button.click()
+                if not self.wait_for_table_change(state):
+                    return False
+            else:
+                trade_history_tab = self.find_element_with_retry(By.CSS_SELECTOR, "#tab-tradeHistory > div")
+                trade_history_tab.click()
+                self.wait_for_rows()
+            self.install_observer()
+            self.current_page = 1
+            return True
+        except Exception as e:
+            logging.info(f"Error refreshing trade history table: {e}")
+            return False
+
+    def find_element_with_retry(self, by, selector, timeout=PAGE_WAIT_TIMEOUT):
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=PAGE_POLL_FREQUENCY).until(
+                EC.presence_of_element_located((by, selector)))
+        except TimeoutException:
+            logging.info(f"Element {selector} not found within {timeout} seconds.")
+            return None
+
+    def has_next_page(self):
+        with self.tab():
+            try:
+                next_page_button = self.driver.find_element(By.CSS_SELECTOR, "div.bn-pagination-next")
+            except NoSuchElementException:
+                return False
+            # is_enabled() only applies to form controls; a div always reports True.
+            disabled = 'disabled' in (next_page_button.get_attribute('class') or '').split()
+            return not disabled and next_page_button.get_attribute('aria-disabled') != 'true'
+
+    def go_to_first_page(self):
+        try:
+            self.driver.get(self.link)
+            self.slot.page_loads += 1
+            self.last_reload = time.monotonic()
             self.navigate_to_trade_history()
+            self.current_page = 1
+        except Exception as e:
+            print(f"Error navigating to first page: {e}")
 
-    def scrape_and_display_orders(self):
+
+SIDE_LABELS = {
+    ('BUY', 'LONG'): 'Open Long',
+    ('SELL', 'LONG'): 'Close Long',
+    ('SELL', 'SHORT'): 'Open Short',
+    ('BUY', 'SHORT'): 'Close Short',
+    ('BUY', 'BOTH'): 'Buy/Long',
+    ('SELL', 'BOTH'): 'Sell/Short',
+}
+
+TRADE_HISTORY_URL = os.environ.get(
+    'TRADE_HISTORY_URL',
+    'https://www.binance.com/bapi/futures/v1/friendly/future/copy-trade/lead-portfolio/trade-history')
+HTTP_PAGE_SIZE = int(os.environ.get('HTTP_PAGE_SIZE', 50))
+
+http_session = requests.Session()
+http_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=32))
+http_session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=32))
+
+
+def portfolio_id(link):
+    match = re.search(r'(\d+)/?(?:\?.*)?$', link or '')
+    return match.group(1) if match else None
+
+
+def decimal_text(value):
+    return format(decimal.Decimal(str(value)), 'f')
+
+
+class HttpSource:
+    pool_slot = None
+    browser_recycles = 0
+
+    def __init__(self, link, url=TRADE_HISTORY_URL, page_size=HTTP_PAGE_SIZE, session=http_session):
+        self.link = link
+        self.url = url
+        self.page_size = page_size
+        self.session = session
+        self.portfolio_id = portfolio_id(link)
+        if not self.portfolio_id:
+            raise ValueError(f"No portfolio ID in trader link {link}.")
+        self.current_page = 1
+        self.total = 0
+
+    def open(self):
+        logging.info(f"HTTP source for portfolio {self.portfolio_id} ready.")
+
+    def close(self):
+        pass
+
+    def rss_mb(self):
+        return 0.0
+
+    def record_cycle(self):
+        pass
+
+    def recycle(self):
+        pass
+
+    def fetch_rows(self):
+        response = self.session.post(self.url, json={
+            "pageNumber": self.current_page,
+            "pageSize": self.page_size,
+            "portfolioId": self.portfolio_id,
+        }, timeout=10)
+        response.raise_for_status()
+        data = response.json()['data']
+        self.total = int(data.get('total') or 0)
+        return [self.trade_to_cells(trade) for trade in data.get('list') or []]
+
+    @staticmethod
+    def trade_to_cells(trade):
+        time_str = datetime.datetime.fromtimestamp(trade['time'] / 1000).strftime('%Y-%m-%d %H:%M:%S')
+        side = SIDE_LABELS.get((trade['side'], trade.get('positionSide', 'BOTH')), trade['side'])
+        quantity = trade.get('qty', trade.get('quantity'))
+        return [time_str, trade['symbol'], side, decimal_text(trade['price']),
+                decimal_text(quantity), decimal_text(trade.get('realizedProfit', 0))]
+
+    def has_next_page(self):
+        return self.current_page * self.page_size < self.total
+
+    def next_page(self):
+        self.current_page += 1
+        return True
+
+    def refresh(self):
+        self.current_page = 1
+
+    def wait_for_change(self, timeout):
+        time.sleep(timeout)
+        return False
+
+
+SOURCES = {
+    'selenium': SeleniumSource,
+    'http': HttpSource,
+}
+
+
+DEDUP_DIR = os.environ.get('DEDUP_DIR')
+DEDUP_TTL = int(os.environ.get('DEDUP_TTL', 3600))
+
+
+class FileStore:
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
         try:
-            while self.running:
-                self.current_time = datetime.datetime.now().replace(second=0, microsecond=0)
-                logging.info(f"Current time: {self.current_time}")
-
-                found_data = False
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                orders = soup.select(".css-g5h8k8 > div > div > div > table > tbody > tr")
-
-                for order in orders:
-                    time_str = order.select_one("td:nth-child(1)").text.strip()
-                    order_time = datetime.datetime.strptime(time_str, '%Y-%m-%d %H:%M:%S').replace(second=0, microsecond=0)
-                    time_diff = (self.current_time - order_time).total_seconds() / 60
-
-                    if abs(time_diff) <= 2:
-                        symbol = order.select_one("td:nth-child(2)").text.strip()
-                        side = order.select_one("td:nth-child(3)").text.strip()
-                        price_str = order.select_one("td:nth-child(4)").text.strip()
-                        quantity_str = order.select_one("td:nth-child(5)").text.strip()
-                        realized_profit_str = order.select_one("td:nth-child(6)").text.strip()
-
-                        price = float(re.sub(r'[^\d.]', '', price_str.replace(',', '')))
-                        quantity_str = quantity_str.split(' ', 1)[0].replace(',', '')
-                        quantity = float(quantity_str)
-                        realized_profit_str = realized_profit_str.replace('USDT', '').strip()
-                        realized_profit = float(realized_profit_str.replace(',', ''))
-
-                        symbol = self.add_space_before_and_remove_perpetual(symbol)
-
-                        order_id = f"{time_str}-{symbol}-{side}-{price}"
-                        if order_id not in self.processed_orders:
-                            self.processed_orders.add(order_id)
-                            order_data = {
-                                "Time": time_str,
-                                "Symbol": symbol,
-                                "Side": side,
-                                "Price": price,
-                                "Quantity": quantity,
-                                "Realized Profit": realized_profit
-                            }
-                            self.all_orders.append(order_data)
-                            found_data = True
-                            logging.info(f"Added order: {order_id}")
-                            self.exec_order(symbol, side, quantity, realized_profit)
-                            time.sleep(2)
-
-                if not found_data:
-                    print("No data found on current page.")
-                    self.go_to_first_page()
-                    continue
+            with open(self.path) as store_file:
+                return store_file.read()
+        except FileNotFoundError:
+            return None
+
+    def save(self, data):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as store_file:
+            store_file.write(data)
+        os.replace(tmp_path, self.path)
+
+
+class RedisStore:
+    def __init__(self, redis_client, key, ttl=DEDUP_TTL):
+        self.redis = redis_client
+        self.key = key
+        self.ttl = ttl
+
+    def load(self):
+        return self.redis.get(self.key)
 
-                next_page_button = self.find_element_with_retry(By.CSS_SELECTOR, "div.bn-pagination-next")
-                self.driver.execute_script("arguments[0].scrollIntoView(true);", next_page_button)
-                next_page_button.click()
-                print("Navigated to next page.")
-                time.sleep(2)
-                self.current_page += 1
+    def save(self, data):
+        self.redis.set(self.key, data, ex=self.ttl)
 
-                if not self.has_next_page():
-                    print("No next page found. Returning to first page.")
-                    self.go_to_first_page()
-                    time.sleep(2)
 
-                self.save_orders_to_file()
+class DedupWindow:
+    def __init__(self, store=None):
+        self.store = store
+        # Minute ("YYYY-MM-DD HH:MM") -> set of 64-bit row fingerprints seen in that minute.
+        self.buckets = {}
+        self.dirty = False
+        if store:
+            self.load()
 
+    @staticmethod
+    def fingerprint(row_id):
+        return int.from_bytes(hashlib.blake2b(row_id.encode(), digest_size=8).digest(), 'big')
+
+    def __contains__(self, row_id):
+        fingerprint = self.fingerprint(row_id)
+        return any(fingerprint in bucket for bucket in self.buckets.values())
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.buckets.values())
+
+    def add(self, row_id, time_str):
+        self.buckets.setdefault(time_str[:16], set()).add(self.fingerprint(row_id))
+        self.dirty = True
+
+    def evict(self, window_start):
+        cutoff = window_start[:16]
+        for minute in [minute for minute in self.buckets if minute < cutoff]:
+            del self.buckets[minute]
+            self.dirty = True
+
+    def load(self):
+        try:
+            data = self.store.load()
+            if data:
+                self.buckets = {minute: set(fingerprints) for minute, fingerprints in json.loads(data).items()}
+                logging.info(f"Loaded {len(self)} processed orders.")
+        except Exception as e:
+            logging.info(f"Error loading processed orders: {e}")
+
+    def save(self):
+        if not self.store or not self.dirty:
+            return
+        try:
+            self.store.save(json.dumps({minute: list(fingerprints) for minute, fingerprints in self.buckets.items()}))
+            self.dirty = False
         except Exception as e:
-            print(f"Error scraping and displaying orders: {e}")
-            self.running = True
-            self.scrape_and_display_orders()
-
-    def exec_order(self, symbol, side, quantity, realized_profit):
-        client = self.binance_client
-        if side in ['Open Long', 'Buy/Long'] and realized_profit == 0.0:
-            quantity = float(quantity)
-            quantity = (quantity * float(self.your_portfolio_size)) / float(self.trader_portfolio_size)
-            minQt = client.get_symbol_info(symbol)
-            minQuantity = float(minQt['filters'][6]['minNotional'])
-            stepSize = float(next(f['stepSize'] for f in minQt['filters'] if f['filterType'] == 'LOT_SIZE'))
-            quantity_precision = int(round(-math.log(stepSize, 10)))
-            quantity = round(quantity, quantity_precision)
-            side = 'BUY'
-            position_side = 'LONG'
-            if quantity < minQuantity:
-                quantity = minQuantity
+            logging.info(f"Error saving processed orders: {e}")
+
+
+def link_key(link):
+    return hashlib.sha1(link.encode()).hexdigest()[:16]
+
+
+def dedup_store(key):
+    # Under the registry a trader can move between workers and hosts, so its dedup window lives in Redis.
+    if task_registry:
+        return RedisStore(task_registry.redis, f"{task_registry.prefix}:dedup:{key}")
+    if DEDUP_DIR:
+        return FileStore(os.path.join(DEDUP_DIR, f"dedup_{key}.json"))
+    return None
+
+
+ORDER_SUMMARY_WINDOW = int(os.environ.get('ORDER_SUMMARY_WINDOW', 300))
+
+
+class OrderAggregate:
+    def __init__(self, window=ORDER_SUMMARY_WINDOW, clock=time.monotonic):
+        self.window = window
+        self.clock = clock
+        # (symbol, side, price) -> [summary row, number of orders still inside the window]
+        self.entries = {}
+        self.events = deque()
+        self.lock = threading.Lock()
+
+    def add(self, order):
+        now = self.clock()
+        key = (order['Symbol'], order['Side'], order['Price'])
+        with self.lock:
+            self.expire(now)
+            entry = self.entries.get(key)
+            if entry is None:
+                self.entries[key] = [dict(order), 1]
+            else:
+                entry[0]['Quantity'] += order['Quantity']
+                entry[0]['Realized Profit'] += order['Realized Profit']
+                entry[1] += 1
+            self.events.append((now, key, order['Quantity'], order['Realized Profit']))
+
+    def expire(self, now):
+        cutoff = now - self.window
+        while self.events and self.events[0][0] <= cutoff:
+            _, key, quantity, realized_profit = self.events.popleft()
+            entry = self.entries[key]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self.entries[key]
+            else:
+                entry[0]['Quantity'] -= quantity
+                entry[0]['Realized Profit'] -= realized_profit
+
+    def summary(self):
+        with self.lock:
+            self.expire(self.clock())
+            return [dict(entry[0]) for entry in self.entries.values()]
+
+
+JOURNAL_DIR = os.environ.get('JOURNAL_DIR', 'journals')
+JOURNAL_FLUSH_RECORDS = int(os.environ.get('JOURNAL_FLUSH_RECORDS', 50))
+JOURNAL_FLUSH_INTERVAL = float(os.environ.get('JOURNAL_FLUSH_INTERVAL', 1.0))
+JOURNAL_MAX_BYTES = int(os.environ.get('JOURNAL_MAX_BYTES', 10 * 1024 * 1024))
+JOURNAL_BACKUPS = int(os.environ.get('JOURNAL_BACKUPS', 5))
+
+
+class TradeJournal:
+    def __init__(self, task_id, directory=JOURNAL_DIR, flush_records=JOURNAL_FLUSH_RECORDS,
+                 flush_interval=JOURNAL_FLUSH_INTERVAL, max_bytes=JOURNAL_MAX_BYTES, backups=JOURNAL_BACKUPS):
+        self.directory = directory
+        self.path = os.path.join(directory, re.sub(r'[^\w.-]', '_', str(task_id)) + '.jsonl')
+        self.flush_records = flush_records
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.buffer = []
+        self.last_flush = time.monotonic()
+        self.lock = threading.Lock()
+
+    def append(self, record):
+        line = json.dumps(record, separators=(',', ':'))
+        with self.lock:
+            self.buffer.append(line)
+            if len(self.buffer) >= self.flush_records:
+                self._flush()
+
+    def flush_if_due(self):
+        with self.lock:
+            if self.buffer and time.monotonic() - self.last_flush >= self.flush_interval:
+                self._flush()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        self.last_flush = time.monotonic()
+        if not self.buffer:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path, 'a') as journal_file:
+            journal_file.write('\n'.join(self.buffer) + '\n')
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+            size = journal_file.tell()
+        self.buffer.clear()
+        if size >= self.max_bytes:
+            self.rotate()
+
+    def rotate(self):
+        for index in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{index}"):
+                os.replace(f"{self.path}.{index}", f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+        logging.info(f"Rotated trade journal {self.path}.")
+
+    def files(self):
+        paths = [f"{self.path}.{index}" for index in range(self.backups, 0, -1)] + [self.path]
+        return [path for path in paths if os.path.exists(path)]
+
+    def iter_lines(self):
+        self.flush()
+        for path in self.files():
             try:
-                client.futures_create_order(symbol=symbol,
-                                            side=side,
-                                            positionSide=position_side,
-                                            type='MARKET',
-                                            leverage=int(self.leverage),
-                                            quantity=quantity)
-                logging.info(f"Executed order: {symbol} {side} {quantity}")
+                with open(path) as journal_file:
+                    for line in journal_file:
+                        yield line
+            except FileNotFoundError:
+                continue
+
+    def read(self):
+        for line in self.iter_lines():
+            yield json.loads(line)
+
+
+ORDER_WORKERS = int(os.environ.get('ORDER_WORKERS', 4))
+MIN_POLL_INTERVAL = float(os.environ.get('MIN_POLL_INTERVAL', 0.5))
+MAX_POLL_INTERVAL = float(os.environ.get('MAX_POLL_INTERVAL', 10))
+BATCH_ORDER_LIMIT = 5
+UNKNOWN_STATUS_CODE = -1007
+SUPERVISOR_MIN_BACKOFF = float(os.environ.get('SUPERVISOR_MIN_BACKOFF', 1))
+SUPERVISOR_MAX_BACKOFF = float(os.environ.get('SUPERVISOR_MAX_BACKOFF', 60))
+
+
+def rejected(error):
+    # Only a 4xx answer means the exchange turned the request down. A 5xx or -1007 (send status unknown) may
+    # still have executed it.
+    return 400 <= error.status_code < 500 and error.code != UNKNOWN_STATUS_CODE
+
+
+def batch_chunks(orders, size=BATCH_ORDER_LIMIT):
+    # Orders inside one batch are not executed in sequence by the exchange, so a chunk holds at most
+    # one order per symbol and later orders for that symbol go into later chunks.
+    chunks = []
+    last_chunk = {}
+    for order in orders:
+        index = last_chunk.get(order['symbol'], -1) + 1
+        while index < len(chunks) and len(chunks[index]) >= size:
+            index += 1
+        if index == len(chunks):
+            chunks.append([])
+        chunks[index].append(order)
+        last_chunk[order['symbol']] = index
+    return chunks
+
+
+def order_params(order):
+    params = {key: value for key, value in order.items() if key != 'row_time'}
+    params['newOrderRespType'] = 'RESULT'
+    return params
+
+
+def batch_order_params(order):
+    params = {key: str(value) for key, value in order.items() if key not in ('leverage', 'row_time')}
+    params['newOrderRespType'] = 'RESULT'
+    return params
+
+
+OrderRule = namedtuple('OrderRule', ['side', 'position_side', 'closing'])
+CLOSE_HEADROOM = 1.05
+
+
+def compile_order_rules():
+    # (side label, realized PnL nonzero) -> the copy order. A row with realized PnL closes a position.
+    base = {
+        ('Open Long', False): OrderRule('BUY', 'LONG', False),
+        ('Buy/Long', False): OrderRule('BUY', 'LONG', False),
+        ('Close Long', True): OrderRule('SELL', 'LONG', True),
+        ('Sell/Short', True): OrderRule('SELL', 'LONG', True),
+        ('Open Short', False): OrderRule('SELL', 'SHORT', False),
+        ('Sell/Short', False): OrderRule('SELL', 'SHORT', False),
+        ('Close Short', True): OrderRule('BUY', 'SHORT', True),
+        ('Buy/Long', True): OrderRule('BUY', 'SHORT', True),
+    }
+    # close_only_mode and reverse_copy have never changed what gets copied, and saved UI settings may have them
+    # ticked, so every flag combination maps to the same order until applying them is made an explicit opt-in.
+    # Keys missing from the table mean no copy order.
+    rules = {}
+    for (label, pnl_nonzero), rule in base.items():
+        for close_only in (False, True):
+            for reverse in (False, True):
+                rules[(label, pnl_nonzero, close_only, reverse)] = rule
+    return rules
+
+
+ORDER_RULES = compile_order_rules()
+
+
+class OrderExecutor:
+    def __init__(self, name, workers=ORDER_WORKERS):
+        self.name = name
+        # One queue per worker; a symbol always maps to the same queue so its orders stay in sequence.
+        self.queues = [queue.Queue() for _ in range(workers)]
+        self.lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.queued = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+        self.threads = []
+        for index, order_queue in enumerate(self.queues):
+            thread = threading.Thread(target=self.worker, args=(order_queue,), name=f"{name}-orders-{index}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, orders, func):
+        groups = {}
+        for order in orders:
+            index = zlib.crc32(order['symbol'].encode()) % len(self.queues)
+            groups.setdefault(index, []).append(order)
+        with self.lock:
+            self.submitted += len(orders)
+            self.queued += len(orders)
+        submitted_at = time.monotonic()
+        for index, group in groups.items():
+            self.queues[index].put((submitted_at, func, group))
+
+    def worker(self, order_queue):
+        while True:
+            item = order_queue.get()
+            if item is None:
+                break
+            submitted_at, func, orders = item
+            with self.lock:
+                self.queued -= len(orders)
+            try:
+                func(orders)
             except Exception as e:
-                logging.info(f"Error executing order: {e}")
-
-        elif side in ['Close Long', 'Sell/Short'] and realized_profit != 0.0:
-            quantity = float(quantity)
-            quantity = ((quantity * float(self.your_portfolio_size)) / float(self.trader_portfolio_size)) * 1.05
-            minQt = client.get_symbol_info(symbol)
-            minQuantity = float(minQt['filters'][6]['minNotional'])
-            stepSize = float(next(f['stepSize'] for f in minQt['filters'] if f['filterType'] == 'LOT_SIZE'))
-            quantity_precision = int(round(-math.log(stepSize, 10)))
-            quantity = round(quantity, quantity_precision)
-            side = 'SELL'
-            position_side = 'LONG'
-            if quantity < minQuantity:
-                quantity = minQuantity
+                logging.info(f"Error executing queued orders: {e}")
+            latency = time.monotonic() - submitted_at
+            with self.lock:
+                self.completed += len(orders)
+                self.last_latency = latency
+                self.max_latency = max(self.max_latency, latency)
+                # Every order in the group waited this long, so the average is per order like completed.
+                self.total_latency += latency * len(orders)
+
+    def queue_depth(self):
+        return self.queued
+
+    def stats(self):
+        with self.lock:
+            average_latency = self.total_latency / self.completed if self.completed else 0.0
+            return {
+                "queue_depth": self.queue_depth(),
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "last_latency_ms": round(self.last_latency * 1000, 1),
+                "avg_latency_ms": round(average_latency * 1000, 1),
+                "max_latency_ms": round(self.max_latency * 1000, 1),
+            }
+
+    def shutdown(self):
+        for order_queue in self.queues:
+            order_queue.put(None)
+
+
+class PositionBook:
+    def __init__(self):
+        self.positions = {}
+        self.unknown = set()
+        self.pending = {}
+        self.seeded = False
+        self.lock = threading.Lock()
+
+    def seed(self, client):
+        try:
+            positions = client.futures_position_information()
+        except Exception as e:
+            logging.info(f"Error loading positions, closes will use fixed sizing: {e}")
+            return
+        with self.lock:
+            for position in positions:
+                amount = float(position.get('positionAmt', 0))
+                position_side = position.get('positionSide', 'BOTH')
+                if position_side == 'BOTH':
+                    position_side = 'LONG' if amount > 0 else 'SHORT'
+                if amount:
+                    self.positions[(position['symbol'], position_side)] = abs(amount)
+            self.seeded = True
+
+    def held(self, symbol, position_side):
+        key = (symbol, position_side)
+        with self.lock:
+            # Orders still queued or in flight haven't reached the book yet, so it can't be trusted for that key.
+            if not self.seeded or key in self.unknown or self.pending.get(key):
+                return None
+            return self.positions.get(key, 0.0)
+
+    def add_pending(self, orders):
+        with self.lock:
+            for order in orders:
+                key = (order['symbol'], order['positionSide'])
+                self.pending[key] = self.pending.get(key, 0) + 1
+
+    def settle(self, orders):
+        with self.lock:
+            for order in orders:
+                key = (order['symbol'], order['positionSide'])
+                count = self.pending.get(key, 0) - 1
+                if count > 0:
+                    self.pending[key] = count
+                else:
+                    self.pending.pop(key, None)
+
+    def mark_unknown(self, order):
+        with self.lock:
+            self.unknown.add((order['symbol'], order['positionSide']))
+
+    def apply_fill(self, order, result):
+        key = (order['symbol'], order['positionSide'])
+        filled = float(result.get('executedQty') or 0)
+        with self.lock:
+            if not filled:
+                # The fill wasn't reported, so stop trusting this position rather than guess.
+                self.unknown.add(key)
+                return
+            current = self.positions.get(key, 0.0)
+            if (order['side'] == 'BUY') == (order['positionSide'] == 'LONG'):
+                self.positions[key] = current + filled
+            else:
+                self.positions[key] = max(current - filled, 0.0)
+
+    def snapshot(self):
+        with self.lock:
+            return {f"{symbol} {position_side}": amount for (symbol, position_side), amount in self.positions.items()}
+
+
+def sync_server_time(client):
+    try:
+        server_time = client.futures_time()['serverTime']
+        client.timestamp_offset = server_time - int(time.time() * 1000)
+        logging.info(f"Binance server time offset: {client.timestamp_offset} ms")
+    except Exception as e:
+        logging.info(f"Error syncing Binance server time: {e}")
+
+
+class ClientPool:
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, api_key, api_secret):
+        # Tasks sharing an API key share one client, its keep-alive connections and its position book.
+        with self.lock:
+            entry = self.entries.get(api_key)
+            if entry is not None:
+                entry['users'] += 1
+                return entry['client'], entry['positions']
+
+        # Connecting takes several round trips, so it happens outside the lock and doesn't hold up other launches.
+        client = Client(api_key, api_secret)
+        client.session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=ORDER_WORKERS * 2))
+        sync_server_time(client)
+        positions = PositionBook()
+        positions.seed(client)
+
+        with self.lock:
+            entry = self.entries.get(api_key)
+            if entry is None:
+                entry = self.entries[api_key] = {'client': client, 'positions': positions, 'users': 0}
+            else:
+                client.session.close()
+            entry['users'] += 1
+            return entry['client'], entry['positions']
+
+    def release(self, api_key):
+        with self.lock:
+            entry = self.entries.get(api_key)
+            if entry is None:
+                return
+            entry['users'] -= 1
+            if entry['users'] <= 0:
+                del self.entries[api_key]
+                entry['client'].session.close()
+
+
+client_pool = ClientPool()
+
+
+class ScrapeTask:
+    def __init__(self, link, source='selenium'):
+        self.link = link
+        self.source_name = source
+        self.source = None
+        self.processed_orders = DedupWindow(dedup_store(link_key(link)))
+        self.current_time = None
+        self.metrics = TaskMetrics(SCRAPE_STAGES)
+        self.poll_interval = MIN_POLL_INTERVAL
+        self.cycles = 0
+        self.pages_last_cycle = 0
+        self.pages_total = 0
+        self.running = False
+        self.wake = threading.Event()
+        self.source_lock = threading.Lock()
+        self.backoff = SUPERVISOR_MIN_BACKOFF
+        self.restarts = 0
+        self.last_error = None
+        self.followers = {}
+        self.followers_lock = threading.Lock()
+
+    def subscribe(self, follower):
+        with self.followers_lock:
+            self.followers[follower.task_id] = follower
+            follower.scraper = self
+
+    def unsubscribe(self, task_id):
+        with self.followers_lock:
+            self.followers.pop(task_id, None)
+            return len(self.followers)
+
+    def current_followers(self):
+        with self.followers_lock:
+            return list(self.followers.values())
+
+    def stop(self):
+        if self.running:
+            self.running = False
+            self.wake.set()
+            self.close_source()
+            logging.info(f"Scraper for {self.link} stopped.")
+        else:
+            logging.info(f"Scraper for {self.link} is not running.")
+
+    def open_source(self):
+        source = SOURCES[self.source_name](self.link)
+        with self.source_lock:
+            self.source = source
+        source.open()
+
+    def close_source(self):
+        with self.source_lock:
+            source, self.source = self.source, None
+        if source:
+            source.close()
+
+    def start_scraping(self):
+        self.running = True
+        self.supervise()
+
+    def supervise(self):
+        # Restart the scrape loop on errors with exponential backoff instead of recursing. The dedup window
+        # belongs to the task, so it survives source restarts and browser recycling.
+        while self.running:
             try:
-                client.futures_create_order(symbol=symbol,
-                                            side=side,
-                                            positionSide=position_side,
-                                            type='MARKET',
-                                            leverage=int(self.leverage),
-                                            quantity=quantity)
-                logging.info(f"Executed order: {symbol} {side} {quantity}")
+                if not self.source:
+                    self.open_source()
+                self.scrape_and_display_orders()
             except Exception as e:
-                logging.info(f"Error executing order: {e}")
-
-        elif side in ['Open Short', 'Sell/Short'] and realized_profit == 0.0:
-            side = 'SELL'
-            position_side = 'SHORT'
-            quantity = float(quantity)
-            quantity = (quantity * float(self.your_portfolio_size)) / float(self.trader_portfolio_size)
-            minQt = client.get_symbol_info(symbol)
-            minQuantity = float(minQt['filters'][6]['minNotional'])
-            stepSize = float(next(f['stepSize'] for f in minQt['filters'] if f['filterType'] == 'LOT_SIZE'))
-            quantity_precision = int(round(-math.log(stepSize, 10)))
-            quantity = round(quantity, quantity_precision)
-            if quantity < minQuantity:
-                quantity = minQuantity
+                if not self.running:
+                    break
+                print(f"Error scraping and displaying orders: {e}")
+                self.last_error = str(e)
+                self.restarts += 1
+                source = self.source
+                if source and self.backoff > SUPERVISOR_MIN_BACKOFF:
+                    # No healthy cycle since the last restart, so the browser itself may be wedged. A shared
+                    # browser is only recycled once every tab on it is failing.
+                    source.recycle()
+                self.close_source()
+                logging.info(f"Restarting scraper for {self.link} in {self.backoff:.0f}s.")
+                self.wake.wait(self.backoff)
+                self.backoff = min(self.backoff * 2, SUPERVISOR_MAX_BACKOFF)
+        self.close_source()
+
+    def scrape_and_display_orders(self):
+        while self.running:
+            self.current_time = datetime.datetime.now().replace(second=0, microsecond=0)
+            logging.info(f"Current time: {self.current_time}")
+
+            window_start, window_end = self.acceptance_window()
+            self.processed_orders.evict(window_start)
+
+            detected = []
+            pages = 0
+            try:
+                while self.running:
+                    with self.metrics.timer('dom_fetch'):
+                        rows = self.source.fetch_rows()
+                    pages += 1
+                    page_detected, reached_watermark = self.process_rows(rows, window_start, window_end)
+                    detected.extend(page_detected)
+                    # Rows are newest first: once a page reaches rows older than the window, later pages can't hold fresh ones.
+                    if reached_watermark or not rows or not self.source.has_next_page():
+                        break
+                    with self.metrics.timer('page_load'):
+                        # The pager didn't move, so this is the last page even if it didn't say so.
+                        if not self.source.next_page():
+                            break
+            finally:
+                # Rows already passed dedup, so copy them even if a later page failed. The table is newest first;
+                # copy oldest first so each symbol's orders replay in the trader's order.
+                if detected:
+                    self.fan_out(detected[::-1])
+            self.record_cycle(pages)
+            self.backoff = SUPERVISOR_MIN_BACKOFF
+            self.source.record_cycle()
+            for follower in self.current_followers():
+                follower.journal.flush_if_due()
+
+            if detected:
+                self.poll_interval = MIN_POLL_INTERVAL
+            else:
+                print("No new orders found.")
+                self.poll_interval = min(self.poll_interval * 2, MAX_POLL_INTERVAL)
+            changed = self.source.wait_for_change(self.poll_interval)
+            if not changed or self.source.current_page != 1:
+                with self.metrics.timer('page_load'):
+                    self.source.refresh()
+
+    def process_rows(self, rows, window_start, window_end):
+        reached_watermark = False
+        detected = []
+        for cells in rows:
+            time_str = cells[0]
+            if time_str < window_start:
+                reached_watermark = True
+                break
+            if time_str >= window_end:
+                continue
+
+            start = time.perf_counter()
+            row_id = "-".join(cells[:4])
+            seen = row_id in self.processed_orders
+            if not seen:
+                self.processed_orders.add(row_id, time_str)
+            self.metrics.observe('dedup', time.perf_counter() - start)
+            if seen:
+                continue
+
+            start = time.perf_counter()
+            order_data = self.parse_trade_row(cells)
+            row_time = datetime.datetime.strptime(time_str, '%Y-%m-%d %H:%M:%S').timestamp()
+            self.metrics.observe('parse', time.perf_counter() - start)
+            self.metrics.detection_lag.observe(max(time.time() - row_time, 0.0))
+
+            logging.info(f"Added order: {time_str}-{order_data['Symbol']}-{order_data['Side']}-{order_data['Price']}")
+            event_broker.publish('row', dict(order_data, link=self.link))
+            detected.append((order_data, row_time))
+
+        self.processed_orders.save()
+        return detected, reached_watermark
+
+    def fan_out(self, detected):
+        # Each follower sizes its own copies and hands them to its own executor, so placement runs in parallel.
+        for follower in self.current_followers():
             try:
-                client.futures_create_order(symbol=symbol,
-                                            side=side,
-                                            positionSide=position_side,
-                                            type='MARKET',
-                                            leverage=int(self.leverage),
-                                            quantity=quantity)
-                logging.info(f"Executed order: {symbol} {side} {quantity}")
+                follower.copy_orders(detected)
             except Exception as e:
-                logging.info(f"Error executing order: {e}")
-
-        elif side in ['Close Short', 'Buy/Long'] and realized_profit != 0.0:
-            quantity = float(quantity)
-            quantity = ((quantity * float(self.your_portfolio_size)) / float(self.trader_portfolio_size)) * 1.05
-            minQt = client.get_symbol_info(symbol)
-            minQuantity = float(minQt['filters'][6]['minNotional'])
-            stepSize = float(next(f['stepSize'] for f in minQt['filters'] if f['filterType'] == 'LOT_SIZE'))
-            quantity_precision = int(round(-math.log(stepSize, 10)))
-            quantity = round(quantity, quantity_precision)
-            side = 'BUY'
-            position_side = 'SHORT'
-            if quantity < minQuantity:
-                quantity = minQuantity
+                logging.info(f"Error copying orders for task {follower.task_id}: {e}")
+
+    def record_cycle(self, pages):
+        self.cycles += 1
+        self.pages_last_cycle = pages
+        self.pages_total += pages
+
+    def cycle_stats(self):
+        return {
+            "cycles": self.cycles,
+            "pages_last_cycle": self.pages_last_cycle,
+            "pages_per_cycle": round(self.pages_total / self.cycles, 2) if self.cycles else 0.0,
+        }
+
+    def supervisor_stats(self):
+        source = self.source
+        return {
+            "restarts": self.restarts,
+            "browser_recycles": source.browser_recycles if source else 0,
+            "last_error": self.last_error,
+            "browser_rss_mb": round(source.rss_mb(), 1) if source else 0.0,
+            "process_rss_mb": round(psutil.Process().memory_info().rss / (1024 * 1024), 1),
+        }
+
+    def acceptance_window(self):
+        # Rows are accepted within 2 minutes of current_time at minute resolution. Timestamps
+        # are zero-padded, so plain string comparison matches datetime comparison.
+        window_start = (self.current_time - datetime.timedelta(minutes=2)).strftime('%Y-%m-%d %H:%M:%S')
+        window_end = (self.current_time + datetime.timedelta(minutes=3)).strftime('%Y-%m-%d %H:%M:%S')
+        return window_start, window_end
+
+    def parse_trade_row(self, cells):
+        time_str, symbol, side, price_str, quantity_str, realized_profit_str = cells[:6]
+
+        price = float(re.sub(r'[^\d.]', '', price_str.replace(',', '')))
+        quantity_str = quantity_str.split(' ', 1)[0].replace(',', '')
+        quantity = float(quantity_str)
+        realized_profit_str = realized_profit_str.replace('USDT', '').strip()
+        realized_profit = float(realized_profit_str.replace(',', ''))
+
+        symbol = self.add_space_before_and_remove_perpetual(symbol)
+
+        return {
+            "Time": time_str,
+            "Symbol": symbol,
+            "Side": side,
+            "Price": price,
+            "Quantity": quantity,
+            "Realized Profit": realized_profit
+        }
+
+    def add_space_before_and_remove_perpetual(self, text):
+        text = re.sub(r" ?Perpetual", "", text)
+        return text.strip()
+
+
+class Follower:
+    def __init__(self, task_id, link, api_key, api_secret, leverage, trader_portfolio_size, your_portfolio_size,
+                 close_only_mode=False, reverse_copy=False):
+        self.task_id = task_id
+        self.link = link
+        self.scraper = None
+        self.binance_client = None
+        self.positions = None
+        self.order_summary = OrderAggregate()
+        self.journal = TradeJournal(task_id)
+        self.metrics = TaskMetrics(ORDER_STAGES)
+        self.running = False
+        self.leverage = leverage
+        self.trader_portfolio_size = trader_portfolio_size
+        self.your_portfolio_size = your_portfolio_size
+        self.close_only_mode = close_only_mode
+        self.reverse_copy = reverse_copy
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.executor = OrderExecutor(f"task-{task_id}")
+        self.initialize_binance_client()
+
+    def stop(self):
+        if self.running:
+            self.running = False
+            self.executor.shutdown()
+            self.journal.flush()
+            if self.binance_client:
+                client_pool.release(self.api_key)
+                self.binance_client = None
+            logging.info(f"Task {self.task_id} stopped.")
+        else:
+            logging.info(f"Task {self.task_id} is not running.")
+
+    def initialize_binance_client(self):
+        try:
+            self.binance_client, self.positions = client_pool.acquire(self.api_key, self.api_secret)
+            logging.info("Binance client initialized.")
+            exchange_info_cache.start(self.binance_client)
+        except Exception as e:
+            logging.info(f"Error initializing Binance client: {e}")
+            self.running = False
+
+    def copy_orders(self, detected):
+        for order_data, row_time in detected:
+            self.order_summary.add(order_data)
+            self.journal.append(order_data)
+
+        start = time.perf_counter()
+        pending_orders = self.size_orders(detected)
+        self.metrics.observe('sizing', time.perf_counter() - start)
+
+        self.journal.flush_if_due()
+        if pending_orders:
+            if self.positions:
+                self.positions.add_pending(pending_orders)
+            self.executor.submit(pending_orders, self.place_orders)
+
+    def place_orders(self, orders):
+        try:
+            self.place_chunks(orders)
+        finally:
+            if self.positions:
+                self.positions.settle(orders)
+
+    def place_chunks(self, orders):
+        for chunk in batch_chunks(orders):
+            if len(chunk) == 1:
+                self.place_order(chunk[0])
+                continue
             try:
-                client.futures_create_order(symbol=symbol,
-                                            side=side,
-                                            positionSide=position_side,
-                                            type='MARKET',
-                                            leverage=int(self.leverage),
-                                            quantity=quantity)
-                logging.info(f"Executed order: {symbol} {side} {quantity}")
+                with self.metrics.timer('futures_place_batch_order'):
+                    results = self.binance_client.futures_place_batch_order(
+                        batchOrders=[batch_order_params(order) for order in chunk])
+            except BinanceAPIException as e:
+                if not rejected(e):
+                    logging.info(f"Batch of {len(chunk)} orders may or may not have executed, not retrying: {e}")
+                    for order in chunk:
+                        self.mark_unknown(order, str(e))
+                    continue
+                # The exchange rejected the whole request, so none of it executed and each order can be retried.
+                logging.info(f"Error executing batch of {len(chunk)} orders, falling back to single orders: {e}")
+                for order in chunk:
+                    self.place_order(order)
+                continue
             except Exception as e:
-                logging.info(f"Error executing order: {e}")
-        if self.close_only_mode:
-            if side in ['Open Long', 'Buy/Long'] and realized_profit == 0.0:
-                return  # Ignore this order in close only mode
-            if side in ['Close Long', 'Sell/Short'] and realized_profit != 0.0:
-                return  # Ignore this order in close only mode
-            
-        if self.reverse_copy:
-            if side in ['Open Long', 'Buy/Long'] and realized_profit == 0.0:
-                side = 'SELL'
-                position_side = 'SHORT'
-                quantity = float(quantity)
-                quantity = ((quantity * float(self.your_portfolio_size)) / float(self.trader_portfolio_size)) * 1.05
-                minQt = client.get_symbol_info(symbol)
-                minQuantity = float(minQt['filters'][6]['minNotional'])
-                stepSize = float(next(f['stepSize'] for f in minQt['filters'] if f['filterType'] == 'LOT_SIZE'))
-                quantity_precision = int(round(-math.log(stepSize, 10)))
-                quantity = round(quantity, quantity_precision)
-                if quantity < minQuantity:
-                    quantity = minQuantity
-                try:
-                    client.futures_create_order(symbol=symbol,
-                                                side=side,
-                                                positionSide=position_side,
-                                                type='MARKET',
-                                                leverage=int(self.leverage),
-                                                quantity=quantity)
-                    logging.info(f"Executed order: {symbol} {side} {quantity}")
-                except Exception as e:
-                    logging.info(f"Error executing order: {e}")
-
-            elif side in ['Close Long', 'Sell/Short'] and realized_profit != 0.0:
-                side = 'BUY'
-                position_side = 'SHORT'
-                quantity = float(quantity)
-                quantity = (quantity * float(self.your_portfolio_size)) / float(self.trader_portfolio_size)
-                minQt = client.get_symbol_info(symbol)
-                minQuantity = float(minQt['filters'][6]['minNotional'])
-                stepSize = float(next(f['stepSize'] for f in minQt['filters'] if f['filterType'] == 'LOT_SIZE'))
-                quantity_precision = int(round(-math.log(stepSize, 10)))
-                quantity = round(quantity, quantity_precision)
-                if quantity < minQuantity:
-                    quantity = minQuantity
-                try:
-                    client.futures_create_order(symbol=symbol,
-                                                side=side,
-                                                positionSide=position_side,
-                                                type='MARKET',
-                                                leverage=int(self.leverage),
-                                                quantity=quantity)
-                    logging.info(f"Executed order: {symbol} {side} {quantity}")
-                except Exception as e:
-                    logging.info(f"Error executing order: {e}")
-
-            elif side in ['Open Short', 'Buy/Long'] and realized_profit == 0.0:
-                side = 'BUY'
-                position_side = 'LONG'
-                quantity = float(quantity)
-                quantity = ((quantity * float(self.your_portfolio_size)) / float(self.trader_portfolio_size)) * 1.05
-                minQt = client.get_symbol_info(symbol)
-                minQuantity = float(minQt['filters'][6]['minNotional'])
-                stepSize = float(next(f['stepSize'] for f in minQt['filters'] if f['filterType'] == 'LOT_SIZE'))
-                quantity_precision = int(round(-math.log(stepSize, 10)))
-                quantity = round(quantity, quantity_precision)
-                if quantity < minQuantity:
-                    quantity = minQuantity
-                try:
-                    client.futures_create_order(symbol=symbol,
-                                                side=side,
-                                                positionSide=position_side,
-                                                type='MARKET',
-                                                leverage=int(self.leverage),
-                                                quantity=quantity)
-                    logging.info(f"Executed order: {symbol} {side} {quantity}")
-                except Exception as e:
-                    logging.info(f"Error executing order: {e}")
-            elif side in ['Close Short', 'Buy/Long'] and realized_profit != 0.0:
-                side = 'SELL'
-                position_side = 'LONG'
-                quantity = float(quantity)
-                quantity = (quantity * float(self.your_portfolio_size)) / float(self.trader_portfolio_size)
-                minQt = client.get_symbol_info(symbol)
-                minQuantity = float(minQt['filters'][6]['minNotional'])
-                stepSize = float(next(f['stepSize'] for f in minQt['filters'] if f['filterType'] == 'LOT_SIZE'))
-                quantity_precision = int(round(-math.log(stepSize, 10)))
-                quantity = round(quantity, quantity_precision)
-                if quantity < minQuantity:
-                    quantity = minQuantity
-                try:
-                    client.futures_create_order(symbol=symbol,
-                                                side=side,
-                                                positionSide=position_side,
-                                                type='MARKET',
-                                                leverage=int(self.leverage),
-                                                quantity=quantity)
-                    logging.info(f"Executed order: {symbol} {side} {quantity}")
-                except Exception as e:
-                    logging.info(f"Error executing order: {e}")
-
-    def find_element_with_retry(self, by, selector, max_attempts=3):
-        attempts = 0
-        while attempts < max_attempts:
+                # A timeout or dropped connection may still have executed the batch; sending it again could double it.
+                logging.info(f"Batch of {len(chunk)} orders may or may not have executed, not retrying: {e}")
+                for order in chunk:
+                    self.mark_unknown(order, str(e))
+                continue
+            for order, result in zip(chunk, results):
+                if 'code' in result:
+                    logging.info(f"Error executing order {order['symbol']} {order['side']}: {result.get('msg')}")
+                    self.report(order, error=result.get('msg'))
+                else:
+                    self.record_copy_lag(order)
+                    self.positions.apply_fill(order, result)
+                    logging.info(f"Executed order: {order['symbol']} {order['side']} {order['quantity']}")
+                    self.report(order, result)
+
+    def place_order(self, order):
+        try:
+            with self.metrics.timer('futures_create_order'):
+                result = self.binance_client.futures_create_order(**order_params(order))
+            self.record_copy_lag(order)
+            self.positions.apply_fill(order, result)
+            logging.info(f"Executed order: {order['symbol']} {order['side']} {order['quantity']}")
+            self.report(order, result)
+        except BinanceAPIException as e:
+            if not rejected(e):
+                logging.info(f"Order {order['symbol']} {order['side']} may or may not have executed: {e}")
+                self.mark_unknown(order, str(e))
+                return
+            logging.info(f"Error executing order: {e}")
+            self.report(order, error=str(e))
+        except Exception as e:
+            logging.info(f"Order {order['symbol']} {order['side']} may or may not have executed: {e}")
+            self.mark_unknown(order, str(e))
+
+    def mark_unknown(self, order, error):
+        if self.positions:
+            self.positions.mark_unknown(order)
+        self.report(order, error=error, status="unknown")
+
+    def report(self, order, result=None, error=None, status=None):
+        event_broker.publish('order', {
+            "task_id": self.task_id,
+            "symbol": order['symbol'],
+            "side": order['side'],
+            "position_side": order['positionSide'],
+            "quantity": order['quantity'],
+            "executed": result.get('executedQty') if result else None,
+            "status": status or ("error" if error else "executed"),
+            "error": error,
+            "copy_lag": round(time.time() - order['row_time'], 3) if 'row_time' in order else None,
+        })
+
+    def record_copy_lag(self, order):
+        if 'row_time' in order:
+            self.metrics.copy_lag.observe(max(time.time() - order['row_time'], 0.0))
+
+    def size_orders(self, detected):
+        your_portfolio_size = float(self.your_portfolio_size)
+        trader_portfolio_size = float(self.trader_portfolio_size)
+        leverage = int(self.leverage)
+        filters = {}
+        # Positions as they will be once the earlier orders of this batch fill, so closes aren't all capped
+        # at the same holding.
+        held = {}
+        orders = []
+        for order_data, row_time in detected:
+            rule = ORDER_RULES.get((order_data['Side'], order_data['Realized Profit'] != 0.0,
+                                    self.close_only_mode, self.reverse_copy))
+            if rule is None:
+                continue
+            symbol = order_data['Symbol']
+            if symbol not in filters:
+                filters[symbol] = exchange_info_cache.get(symbol)
+            if filters[symbol] is None:
+                logging.info(f"Skipping {symbol} {rule.side} {rule.position_side}: symbol not in futures exchange info.")
+                continue
+            key = (symbol, rule.position_side)
+            if key not in held:
+                held[key] = self.positions.held(symbol, rule.position_side) if self.positions else None
+
+            quantity = (float(order_data['Quantity']) * your_portfolio_size) / trader_portfolio_size
+            if rule.closing:
+                # Closes get headroom so the whole position goes, capped at what we hold when that is known.
+                quantity *= CLOSE_HEADROOM
+                if held[key] == 0.0:
+                    logging.info(f"Skipping {symbol} {rule.side} {rule.position_side}: no position to close.")
+                    continue
+                if held[key] is not None:
+                    quantity = min(quantity, held[key])
+            quantity = round(quantity, filters[symbol].precision)
+            if quantity < filters[symbol].min_quantity:
+                quantity = filters[symbol].min_quantity
+            if not quantity:
+                logging.info(f"Skipping {symbol} {rule.side} {rule.position_side}: nothing to trade.")
+                continue
+            if held[key] is not None:
+                held[key] = max(held[key] - quantity, 0.0) if rule.closing else held[key] + quantity
+
+            orders.append({'symbol': symbol,
+                           'side': rule.side,
+                           'positionSide': rule.position_side,
+                           'type': 'MARKET',
+                           'leverage': leverage,
+                           'quantity': quantity,
+                           'row_time': row_time})
+        return orders
+
+
+EVENT_BUFFER = int(os.environ.get('EVENT_BUFFER', 256))
+EVENT_KEEPALIVE = float(os.environ.get('EVENT_KEEPALIVE', 15))
+# Each open stream holds a server thread, so keep this well below the gunicorn --threads in the Procfile.
+EVENT_MAX_CLIENTS = int(os.environ.get('EVENT_MAX_CLIENTS', 8))
+
+
+class EventBroker:
+    def __init__(self, buffer=EVENT_BUFFER, keepalive=EVENT_KEEPALIVE, max_clients=EVENT_MAX_CLIENTS):
+        self.buffer = buffer
+        self.keepalive = keepalive
+        self.max_clients = max_clients
+        self.clients = set()
+        self.lock = threading.Lock()
+        self.last_id = 0
+        self.dropped = 0
+        self.redis = None
+        self.channel = None
+
+    def bridge(self, redis_client, channel):
+        # With several workers, events go through Redis so every stream sees every worker's tasks.
+        self.redis = redis_client
+        self.channel = channel
+        threading.Thread(target=self.listen, name="event-bridge", daemon=True).start()
+
+    def listen(self):
+        while True:
             try:
-                element = self.driver.find_element(by, selector)
-                return element
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    payload = json.loads(message['data'])
+                    self.deliver(payload['event'], payload['data'])
             except Exception as e:
-                attempts += 1
-                logging.info(f"Error finding element {selector} (Attempt {attempts}/{max_attempts}): {e}")
-                time.sleep(2)
-        return None
+                logging.info(f"Error reading events from Redis: {e}")
+                time.sleep(1)
 
-    def has_next_page(self):
+    def publish(self, event, data):
+        if self.redis:
+            try:
+                self.redis.publish(self.channel, json.dumps({'event': event, 'data': data}))
+                return
+            except Exception as e:
+                logging.info(f"Error publishing event to Redis, delivering locally: {e}")
+        self.deliver(event, data)
+
+    def deliver(self, event, data):
+        with self.lock:
+            if not self.clients:
+                return
+            self.last_id += 1
+            message = f"id: {self.last_id}\nevent: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+            clients = list(self.clients)
+        for client in clients:
+            try:
+                client.put_nowait(message)
+            except queue.Full:
+                # A client that can't keep up is dropped, so it never slows the publishers or grows without bound.
+                self.drop(client)
+
+    def drop(self, client):
+        with self.lock:
+            if client not in self.clients:
+                return
+            self.clients.discard(client)
+            self.dropped += 1
+        # Throw away the backlog and queue the sentinel, so the stream ends instead of sending stale events.
+        while True:
+            try:
+                while True:
+                    client.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                client.put_nowait(None)
+                break
+            except queue.Full:
+                continue
+        logging.info("Dropped a slow event stream client.")
+
+    def subscribe(self):
+        client = queue.Queue(maxsize=self.buffer)
+        with self.lock:
+            if len(self.clients) >= self.max_clients:
+                return None
+            self.clients.add(client)
+        return client
+
+    def unsubscribe(self, client):
+        with self.lock:
+            self.clients.discard(client)
+
+    def stream(self, client):
         try:
-            next_page_button = self.driver.find_element(By.CSS_SELECTOR, "div.bn-pagination-next")
-            return next_page_button.is_enabled()
-        except NoSuchElementException:
-            return False
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    message = client.get(timeout=self.keepalive)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                if message is None:
+                    return
+                yield message
+        finally:
+            self.unsubscribe(client)
 
-    def go_to_first_page(self):
+
+event_broker = EventBroker()
+
+
+TASK_CONFIG_FIELDS = ('link', 'api_key', 'api_secret', 'leverage', 'trader_portfolio_size', 'your_portfolio_size')
+
+
+def task_config(data):
+    config = {field: data[field] for field in TASK_CONFIG_FIELDS}
+    config['source'] = data.get('source', 'selenium')
+    config['close_only_mode'] = bool(data.get('close_only_mode', data.get('closeOnlyMode', False)))
+    config['reverse_copy'] = bool(data.get('reverse_copy', data.get('reverseCopy', False)))
+    return config
+
+
+def launch_task(task_id, config):
+    follower = Follower(task_id, config['link'], config['api_key'], config['api_secret'], config['leverage'],
+                        config['trader_portfolio_size'], config['your_portfolio_size'],
+                        config.get('close_only_mode', False), config.get('reverse_copy', False))
+    follower.running = True
+
+    # One scraper per trader link; every task copying the same trader subscribes to it.
+    with scrapers_lock:
+        scraper = trader_scrapers.get(config['link'])
+        started = scraper is None
+        if started:
+            scraper = ScrapeTask(config['link'], config.get('source', 'selenium'))
+            trader_scrapers[config['link']] = scraper
+        scraper.subscribe(follower)
+        running_scrapers[task_id] = follower
+
+    if started:
+        scraper_thread = threading.Thread(target=scraper.start_scraping)
+        scraper_thread.start()
+    else:
+        logging.info(f"Task {task_id} subscribed to the running scraper for {config['link']}.")
+    event_broker.publish('task', {"task_id": task_id, "link": config['link'], "status": "started", "worker": WORKER_ID})
+    return follower
+
+
+def stop_task(task_id):
+    with scrapers_lock:
+        follower = running_scrapers.pop(task_id, None)
+        if not follower:
+            return None
+        scraper = follower.scraper
+        idle = scraper.unsubscribe(task_id) == 0
+        if idle:
+            trader_scrapers.pop(scraper.link, None)
+    follower.stop()
+    if idle:
+        scraper.stop()
+    event_broker.publish('task', {"task_id": task_id, "link": follower.link, "status": "stopped", "worker": WORKER_ID})
+    return follower
+
+
+def task_status(task_id, follower):
+    scraper = follower.scraper
+    source = scraper.source
+    return {"task_id": task_id, "link": follower.link, "source": scraper.source_name,
+            "pool_slot": source.pool_slot if source else None,
+            "followers": len(scraper.followers),
+            "orders": follower.executor.stats(),
+            "positions": follower.positions.snapshot() if follower.positions else {},
+            "pagination": scraper.cycle_stats(),
+            "supervisor": scraper.supervisor_stats()}
+
+
+REDIS_URL = os.environ.get('REDIS_URL')
+TASK_LEASE_SECONDS = int(os.environ.get('TASK_LEASE_SECONDS', 30))
+REGISTRY_INTERVAL = float(os.environ.get('REGISTRY_INTERVAL', 5))
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class TaskRegistry:
+    def __init__(self, redis_client, worker_id=WORKER_ID, lease_seconds=TASK_LEASE_SECONDS,
+                 interval=REGISTRY_INTERVAL, prefix='flsk'):
+        self.redis = redis_client
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.interval = interval
+        self.prefix = prefix
+        self.tasks_key = f"{prefix}:tasks"
+        self.status_key = f"{prefix}:status"
+        self.workers_key = f"{prefix}:workers"
+        self.renewed = {}
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def lease_key(self, link):
+        return f"{self.prefix}:lease:{link_key(link)}"
+
+    def add(self, task_id, config):
+        return bool(self.redis.hsetnx(self.tasks_key, task_id, json.dumps(config)))
+
+    def remove(self, task_id):
+        removed = bool(self.redis.hdel(self.tasks_key, task_id))
+        self.redis.hdel(self.status_key, task_id)
+        return removed
+
+    def configs(self):
+        return {task_id: json.loads(config) for task_id, config in self.redis.hgetall(self.tasks_key).items()}
+
+    def claim(self, link):
+        started = time.monotonic()
+        claimed = bool(self.redis.set(self.lease_key(link), self.worker_id, nx=True, ex=self.lease_seconds))
+        if claimed:
+            self.renewed[link] = started
+        return claimed
+
+    def renew(self, link):
+        started = time.monotonic()
+        renewed = self.if_owner(link, lambda pipe, key: pipe.expire(key, self.lease_seconds))
+        if renewed:
+            self.renewed[link] = started
+        return renewed
+
+    def release(self, link):
+        self.renewed.pop(link, None)
+        return self.if_owner(link, lambda pipe, key: pipe.delete(key))
+
+    def if_owner(self, link, action):
+        key = self.lease_key(link)
+        with self.redis.pipeline() as pipe:
+            try:
+                pipe.watch(key)
+                if pipe.get(key) != self.worker_id:
+                    pipe.unwatch()
+                    return False
+                pipe.multi()
+                action(pipe, key)
+                pipe.execute()
+                return True
+            except redis.WatchError:
+                return False
+
+    def live_workers(self):
+        cutoff = time.time() - self.lease_seconds
+        workers = self.redis.hgetall(self.workers_key)
+        dead = [worker for worker, heartbeat in workers.items() if float(heartbeat) < cutoff]
+        if dead:
+            self.redis.hdel(self.workers_key, *dead)
+        return max(len(workers) - len(dead), 1)
+
+    def heartbeat(self):
+        now = time.time()
+        self.redis.hset(self.workers_key, self.worker_id, now)
+        for task_id, follower in list(running_scrapers.items()):
+            status = task_status(task_id, follower)
+            status.update({"worker": self.worker_id, "heartbeat": now, "running": follower.running,
+                           "summary": follower.order_summary.summary()})
+            self.redis.hset(self.status_key, task_id, json.dumps(status))
+
+    def stop_local(self, task_id):
+        follower = stop_task(task_id)
+        if follower and follower.link not in trader_scrapers:
+            self.release(follower.link)
+
+    def stop_link(self, link, release=True):
+        for task_id, follower in list(running_scrapers.items()):
+            if follower.link == link:
+                stop_task(task_id)
+        if release:
+            self.release(link)
+        else:
+            self.renewed.pop(link, None)
+
+    def expire_stale(self):
+        # When Redis can't be reached the lease can't be renewed and will expire, and another worker can then
+        # claim the trader. Stop copying first, leaving one sync interval of margin before the lease runs out.
+        cutoff = time.monotonic() - max(self.lease_seconds - self.interval, self.interval)
+        for link in list(trader_scrapers):
+            if self.renewed.get(link, 0.0) < cutoff:
+                logging.info(f"Lease on trader {link} could not be renewed in time, stopping its tasks.")
+                self.stop_link(link, release=False)
+
+    def launch(self, task_id, config):
         try:
-            self.driver.get(self.link)
-            time.sleep(2)
-            self.navigate_to_trade_history()
-            self.current_page = 1
+            launch_task(task_id, config)
         except Exception as e:
-            print(f"Error navigating to first page: {e}")
+            logging.info(f"Error starting task {task_id}: {e}")
 
-    def add_space_before_and_remove_perpetual(self, text):
-        text = re.sub(r" ?Perpetual", "", text)
-        return text.strip()
+    def sync(self):
+        with self.lock:
+            self.heartbeat()
+            configs = self.configs()
+            groups = {}
+            for task_id, config in configs.items():
+                groups.setdefault(config['link'], {})[task_id] = config
 
-    def save_orders_to_file(self):
-        summarized_orders = self.summarize_orders(self.all_orders)
-        with open('trade_history.json', 'w') as json_file:
-            json.dump(summarized_orders, json_file, indent=4)
-        print("Orders saved to file.")
-        if self.timer:
-            self.timer.cancel()
-        self.timer = threading.Timer(300, self.delete_orders_from_file)
-        self.timer.start()
-
-    def delete_orders_from_file(self):
-        self.all_orders.clear()
-        with open('trade_history.json', 'w') as json_file:
-            json.dump(self.all_orders, json_file, indent=4)
-        print("Orders deleted from file after 5 minutes.")
-
-    def summarize_orders(self, orders):
-        summarized_orders = {}
-        for order in orders:
-            key = f"{order['Symbol']}_{order['Side']}_{order['Price']}"
-            if key in summarized_orders:
-                summarized_orders[key]['Quantity'] += order['Quantity']
-                summarized_orders[key]['Realized Profit'] += order['Realized Profit']
-            else:
-                summarized_orders[key] = {
-                    "Time": order['Time'],
-                    "Symbol": order['Symbol'],
-                    "Side": order['Side'],
-                    "Price": order['Price'],
-                    "Quantity": order['Quantity'],
-                    "Realized Profit": order['Realized Profit']
-                }
-        return list(summarized_orders.values())
+            for task_id, follower in list(running_scrapers.items()):
+                if task_id not in configs:
+                    logging.info(f"Task {task_id} was removed from the registry, stopping it.")
+                    self.stop_local(task_id)
+            for link in list(trader_scrapers):
+                if not self.renew(link):
+                    logging.info(f"Lost lease on trader {link}, stopping its tasks.")
+                    self.stop_link(link)
+
+            # Leases are per trader link, so one worker scrapes each trader for all of its followers. Take at most
+            # a fair share of the traders; an overloaded worker hands back one trader per pass.
+            fair_share = math.ceil(len(groups) / self.live_workers())
+            if len(trader_scrapers) > fair_share:
+                link = next(iter(trader_scrapers))
+                logging.info(f"Worker {self.worker_id} is over its share, handing back trader {link}.")
+                self.stop_link(link)
+            for link, tasks in groups.items():
+                if link in trader_scrapers:
+                    for task_id, config in tasks.items():
+                        if task_id not in running_scrapers:
+                            self.launch(task_id, config)
+                    continue
+                if len(trader_scrapers) >= fair_share or not self.claim(link):
+                    continue
+                logging.info(f"Worker {self.worker_id} claimed trader {link}.")
+                for task_id, config in tasks.items():
+                    self.launch(task_id, config)
+                if link not in trader_scrapers:
+                    self.release(link)
+            self.heartbeat()
+
+    def running(self):
+        statuses = {task_id: json.loads(status) for task_id, status in self.redis.hgetall(self.status_key).items()}
+        tasks = []
+        for task_id, config in self.configs().items():
+            owner = self.redis.get(self.lease_key(config['link']))
+            status = statuses.get(task_id, {"task_id": task_id, "link": config['link'], "source": config.get('source', 'selenium')})
+            status["worker"] = owner
+            tasks.append(status)
+        return tasks
+
+    def owner(self, task_id):
+        config = self.redis.hget(self.tasks_key, task_id)
+        return self.redis.get(self.lease_key(json.loads(config)['link'])) if config else None
+
+    def status(self, task_id):
+        status = self.redis.hget(self.status_key, task_id)
+        return json.loads(status) if status else None
+
+    def run_once(self):
+        try:
+            self.sync()
+        except Exception as e:
+            logging.info(f"Error syncing task registry: {e}")
+            self.expire_stale()
+
+    def run(self):
+        while True:
+            self.run_once()
+            time.sleep(self.interval)
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="task-registry", daemon=True)
+            self.thread.start()
+
+
+task_registry = TaskRegistry(redis.Redis.from_url(REDIS_URL, decode_responses=True)) if REDIS_URL else None
+if task_registry:
+    task_registry.start()
+    event_broker.bridge(task_registry.redis, f"{task_registry.prefix}:events")
 
 
 @app.route('/')
@@ -445,41 +2001,153 @@ def start_scraper():
     data = request.json
     task_id = data['task_id']
     logging.info(f"Starting scraper with task_id: {task_id}")
-    link = data['link']
-    api_key = data['api_key']
-    api_secret = data['api_secret']
-    leverage = data['leverage']
-    trader_portfolio_size = data['trader_portfolio_size']
-    your_portfolio_size = data['your_portfolio_size']
+    config = task_config(data)
+
+    if config['source'] not in SOURCES:
+        return jsonify({"status": "error", "message": f"Unknown source: {config['source']}."}), 400
+
+    if config['source'] == 'http' and not portfolio_id(config['link']):
+        return jsonify({"status": "error", "message": "Trader link has no portfolio ID."}), 400
+
+    if task_registry:
+        if not task_registry.add(task_id, config):
+            return jsonify({"status": "error", "message": "Scraper with this ID is already running."}), 400
+        task_registry.sync()
+        return jsonify({"status": "success", "message": f"Scraper {task_id} started successfully."})
 
     if task_id in running_scrapers:
         return jsonify({"status": "error", "message": "Scraper with this ID is already running."}), 400
 
-    scraper = ScrapeTask(task_id, link, api_key, api_secret, leverage, trader_portfolio_size, your_portfolio_size)
-    running_scrapers[task_id] = scraper
-
-    scraper_thread = threading.Thread(target=scraper.start_scraping)
-    scraper_thread.start()
+    launch_task(task_id, config)
 
     return jsonify({"status": "success", "message": f"Scraper {task_id} started successfully."})
 
 @app.route('/running', methods=['GET'])
 def list_running_scrapers():
-    scrapers = [{"task_id": task_id, "link": scraper.link} for task_id, scraper in running_scrapers.items() if scraper.running]
+    if task_registry:
+        return jsonify(task_registry.running())
+    scrapers = [task_status(task_id, follower) for task_id, follower in running_scrapers.items() if follower.running]
     return jsonify(scrapers)
 
+@app.route('/summary/<task_id>', methods=['GET'])
+def order_summary(task_id):
+    if task_id in running_scrapers:
+        return jsonify(running_scrapers[task_id].order_summary.summary())
+    if task_registry and task_registry.owner(task_id):
+        # Running on another worker: serve the summary from its last heartbeat.
+        status = task_registry.status(task_id)
+        if status and 'summary' in status:
+            return jsonify(status['summary'])
+    return jsonify({"status": "error", "message": "Scraper with this ID is not running."}), 404
+
+@app.route('/journal/<task_id>', methods=['GET'])
+def trade_journal(task_id):
+    follower = running_scrapers.get(task_id)
+    owner = task_registry.owner(task_id) if task_registry and not follower else None
+    if owner and owner != task_registry.worker_id:
+        # The owning worker holds the buffered records and possibly the only copy of the files.
+        return jsonify({"status": "error", "message": f"Task {task_id} is running on worker {owner}.",
+                        "worker": owner}), 409
+    journal = follower.journal if follower else TradeJournal(task_id)
+    if not journal.files() and not journal.buffer:
+        return jsonify({"status": "error", "message": "No journal for this task ID."}), 404
+    return Response(journal.iter_lines(), mimetype='application/x-ndjson')
+
+@app.route('/events', methods=['GET'])
+def events():
+    client = event_broker.subscribe()
+    if client is None:
+        return jsonify({"status": "error", "message": "Too many event streams open, poll /running instead."}), 503, \
+            {'Retry-After': '30'}
+    return Response(event_broker.stream(client), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    lines = [
+        '# HELP flsk_scrape_stage_seconds Time spent in each scraping stage, per trader.',
+        '# TYPE flsk_scrape_stage_seconds histogram',
+    ]
+    scrapers = list(trader_scrapers.items())
+    followers = list(running_scrapers.items())
+    for link, scraper in scrapers:
+        for stage, histogram in scraper.metrics.stages.items():
+            render_histogram(lines, 'flsk_scrape_stage_seconds', f'trader="{metric_label(link)}",stage="{stage}"', histogram)
+    lines += [
+        '# HELP flsk_stage_seconds Time spent in each order stage, per task.',
+        '# TYPE flsk_stage_seconds histogram',
+    ]
+    for task_id, follower in followers:
+        for stage, histogram in follower.metrics.stages.items():
+            render_histogram(lines, 'flsk_stage_seconds', f'task="{metric_label(task_id)}",stage="{stage}"', histogram)
+    lines += [
+        '# HELP flsk_detection_lag_seconds Time from a trade-history row timestamp to its detection.',
+        '# TYPE flsk_detection_lag_seconds histogram',
+    ]
+    for link, scraper in scrapers:
+        render_histogram(lines, 'flsk_detection_lag_seconds', f'trader="{metric_label(link)}"', scraper.metrics.detection_lag)
+    lines += [
+        '# HELP flsk_copy_lag_seconds Time from a trade-history row timestamp to the copy order being accepted.',
+        '# TYPE flsk_copy_lag_seconds histogram',
+    ]
+    for task_id, follower in followers:
+        render_histogram(lines, 'flsk_copy_lag_seconds', f'task="{metric_label(task_id)}"', follower.metrics.copy_lag)
+    lines += [
+        '# HELP flsk_order_queue_depth Orders waiting for an execution worker.',
+        '# TYPE flsk_order_queue_depth gauge',
+    ]
+    for task_id, follower in followers:
+        lines.append(f'flsk_order_queue_depth{{task="{metric_label(task_id)}"}} {follower.executor.queue_depth()}')
+    lines += [
+        '# HELP flsk_pages_per_cycle Trade-history pages read in the last detection cycle.',
+        '# TYPE flsk_pages_per_cycle gauge',
+    ]
+    for link, scraper in scrapers:
+        lines.append(f'flsk_pages_per_cycle{{trader="{metric_label(link)}"}} {scraper.pages_last_cycle}')
+    lines += [
+        '# HELP flsk_trader_followers Tasks copying each scraped trader.',
+        '# TYPE flsk_trader_followers gauge',
+    ]
+    for link, scraper in scrapers:
+        lines.append(f'flsk_trader_followers{{trader="{metric_label(link)}"}} {len(scraper.followers)}')
+    lines += [
+        '# HELP flsk_scraper_restarts_total Scrape loop restarts after an error.',
+        '# TYPE flsk_scraper_restarts_total counter',
+    ]
+    for link, scraper in scrapers:
+        lines.append(f'flsk_scraper_restarts_total{{trader="{metric_label(link)}"}} {scraper.restarts}')
+    lines += [
+        '# HELP flsk_browser_recycles_total Browsers recycled in each pool slot.',
+        '# TYPE flsk_browser_recycles_total counter',
+    ]
+    for slot in browser_pool.slots:
+        lines.append(f'flsk_browser_recycles_total{{slot="{slot.index}"}} {slot.recycles}')
+    lines += [
+        '# HELP flsk_event_clients Connected /events streams.',
+        '# TYPE flsk_event_clients gauge',
+        f'flsk_event_clients {len(event_broker.clients)}',
+        '# HELP flsk_event_clients_dropped_total /events streams dropped for falling behind.',
+        '# TYPE flsk_event_clients_dropped_total counter',
+        f'flsk_event_clients_dropped_total {event_broker.dropped}',
+    ]
+    return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
+
 @app.route('/stop', methods=['POST'])
 def stop_scraper():
     data = request.json
     task_id = data['task_id']
 
+    if task_registry:
+        if not task_registry.remove(task_id):
+            return jsonify({"status": "error", "message": "Scraper with this ID is not running."}), 400
+        if task_id in running_scrapers:
+            task_registry.stop_local(task_id)
+        return jsonify({"status": "success", "message": f"Scraper {task_id} stopped successfully."})
+
     if task_id not in running_scrapers:
         return jsonify({"status": "error", "message": "Scraper with this ID is not running."}), 400
 
-    scraper = running_scrapers[task_id]
-    scraper.stop()
-
-    del running_scrapers[task_id]
+    stop_task(task_id)
 
     return jsonify({"status": "success", "message": f"Scraper {task_id} stopped successfully."})
 
@@ -0,0 +1,269 @@
+import argparse
+import array
+import datetime
+import glob
+import json
+import logging
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import requests
+
+import app
+
+
+class FakeBinanceClient:
+    def __init__(self, api_key=None, api_secret=None, latency=0.0, symbols=()):
+        self.latency = latency
+        self.symbols = list(symbols)
+        self.orders = 0
+        self.batches = 0
+        self.lock = threading.Lock()
+        self.session = requests.Session()
+
+    def futures_time(self):
+        return {'serverTime': int(time.time() * 1000)}
+
+    def futures_position_information(self):
+        return []
+
+    def futures_exchange_info(self):
+        return {'symbols': [{
+            'symbol': symbol,
+            'filters': [
+                {'filterType': 'PRICE_FILTER', 'tickSize': '0.01'},
+                {'filterType': 'LOT_SIZE', 'stepSize': '0.001', 'minQty': '0.001'},
+                {'filterType': 'MIN_NOTIONAL', 'notional': '5'},
+            ],
+        } for symbol in self.symbols]}
+
+    def futures_create_order(self, **params):
+        time.sleep(self.latency)
+        with self.lock:
+            self.orders += 1
+        return {'symbol': params['symbol'], 'origQty': str(params['quantity']), 'executedQty': str(params['quantity'])}
+
+    def futures_place_batch_order(self, **params):
+        time.sleep(self.latency)
+        with self.lock:
+            self.batches += 1
+            self.orders += len(params['batchOrders'])
+        return [{'symbol': order['symbol'], 'origQty': order['quantity'], 'executedQty': order['quantity']}
+                for order in params['batchOrders']]
+
+
+class ReplaySource:
+    pool_slot = None
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.current_page = 1
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def fetch_rows(self):
+        return self.pages[self.current_page - 1]
+
+    def has_next_page(self):
+        return self.current_page < len(self.pages)
+
+    def next_page(self):
+        self.current_page += 1
+
+    def refresh(self):
+        self.current_page = 1
+
+    def wait_for_change(self, timeout):
+        return False
+
+
+class SampleMetrics(app.TaskMetrics):
+    def __init__(self, stages=app.STAGES):
+        super().__init__(stages)
+        self.samples = {stage: array.array('d') for stage in stages}
+
+    def observe(self, stage, value):
+        self.samples[stage].append(value)
+        super().observe(stage, value)
+
+    @contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+
+def load_pages(directory):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*'))):
+        if path.endswith('.html'):
+            with open(path) as page_file:
+                pages.append(app.parse_trade_rows_html(page_file.read()))
+        elif path.endswith('.json'):
+            with open(path) as page_file:
+                payload = json.load(page_file)
+            trades = payload['data']['list'] if 'data' in payload else payload
+            pages.append([app.HttpSource.trade_to_cells(trade) for trade in trades])
+    return pages
+
+
+def synthetic_pages(count, rows_per_page, new_rows_per_page, symbols, seed=1):
+    rng = random.Random(seed)
+    sides = ['Open Long', 'Close Long', 'Open Short', 'Close Short', 'Buy/Long', 'Sell/Short']
+    start = datetime.datetime(2024, 1, 1)
+    history = []
+    for index in range(count):
+        now = start + datetime.timedelta(seconds=20 * index)
+        for offset in range(new_rows_per_page):
+            side = rng.choice(sides)
+            closing = side.startswith('Close') or (side in ('Buy/Long', 'Sell/Short') and rng.random() < 0.5)
+            history.insert(0, [
+                (now - datetime.timedelta(seconds=offset)).strftime('%Y-%m-%d %H:%M:%S'),
+                f"{rng.choice(symbols)} Perpetual",
+                side,
+                f"{rng.uniform(0.1, 70000):,.2f}",
+                f"{rng.uniform(0.001, 50):,.3f} BTC",
+                f"{rng.uniform(-500, 500) if closing else 0.0:,.2f} USDT",
+            ])
+        del history[rows_per_page * 4:]
+        yield now, history[:rows_per_page]
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def app_memory():
+    # Only count allocations made by app.py, so the benchmark's own sample lists don't show up as growth.
+    snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(True, app.__file__)])
+    return sum(stat.size for stat in snapshot.statistics('filename'))
+
+
+def drain(follower, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        stats = follower.executor.stats()
+        if stats['completed'] >= stats['submitted']:
+            return
+        time.sleep(0.01)
+
+
+def run(pages, latency, workers, sample_every, symbols):
+    app.Client = lambda api_key, api_secret: FakeBinanceClient(api_key, api_secret, latency, symbols)
+    journal_dir = tempfile.mkdtemp(prefix='flsk-bench-')
+    task = app.ScrapeTask('replay')
+    task.metrics = SampleMetrics(app.SCRAPE_STAGES)
+    follower = app.Follower('bench', 'replay', 'key', 'secret', 1, 1000, 100)
+    follower.executor.shutdown()
+    follower.executor = app.OrderExecutor('bench', workers)
+    follower.journal = app.TradeJournal('bench', directory=journal_dir)
+    follower.metrics = SampleMetrics(app.ORDER_STAGES)
+    simulated_clock = [0.0]
+    follower.order_summary.clock = lambda: simulated_clock[0]
+    follower.running = True
+    task.subscribe(follower)
+    task.running = True
+
+    tracemalloc.start()
+    memory = []
+    rows_seen = 0
+    start = time.perf_counter()
+    for index, (current_time, rows) in enumerate(pages):
+        task.source = ReplaySource([rows])
+        task.current_time = current_time.replace(second=0, microsecond=0)
+        simulated_clock[0] = current_time.timestamp()
+        window_start, window_end = task.acceptance_window()
+        task.processed_orders.evict(window_start)
+        with task.metrics.timer('dom_fetch'):
+            rows = task.source.fetch_rows()
+        detected, _ = task.process_rows(rows, window_start, window_end)
+        if detected:
+            task.fan_out(detected[::-1])
+        rows_seen += len(rows)
+        if index % sample_every == 0:
+            memory.append(app_memory())
+    detect_elapsed = time.perf_counter() - start
+    drain(follower)
+    total_elapsed = time.perf_counter() - start
+    memory.append(app_memory())
+    tracemalloc.stop()
+    follower.stop()
+    task.stop()
+    samples = dict(task.metrics.samples, **follower.metrics.samples)
+
+    return {
+        'pages': index + 1,
+        'rows': rows_seen,
+        'orders': follower.executor.stats()['completed'],
+        'rows_per_sec': round(rows_seen / detect_elapsed, 1) if detect_elapsed else 0.0,
+        'end_to_end_sec': round(total_elapsed, 3),
+        'stages': {
+            stage: {
+                'count': len(values),
+                'p50_ms': round(percentile(values, 0.50) * 1000, 4),
+                'p99_ms': round(percentile(values, 0.99) * 1000, 4),
+            } for stage, values in samples.items() if values
+        },
+        'memory_start_kb': round(memory[0] / 1024, 1),
+        'memory_end_kb': round(memory[-1] / 1024, 1),
+        'memory_growth_kb': round((memory[-1] - memory[0]) / 1024, 1),
+        'dedup_entries': len(task.processed_orders),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay trade-history pages through the scrape-to-order path.")
+    parser.add_argument('--pages', help="directory of recorded .html table pages or .json trade-history payloads")
+    parser.add_argument('--synthetic', type=int, default=5000, help="number of synthetic pages when --pages is not given")
+    parser.add_argument('--rows-per-page', type=int, default=10)
+    parser.add_argument('--new-rows-per-page', type=int, default=2)
+    parser.add_argument('--symbols', type=int, default=20)
+    parser.add_argument('--latency-ms', type=float, default=20.0, help="simulated exchange latency per request")
+    parser.add_argument('--workers', type=int, default=app.ORDER_WORKERS)
+    parser.add_argument('--sample-every', type=int, default=100, help="pages between memory samples")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    symbols = [f"SYM{index}USDT" for index in range(args.symbols)]
+    if args.pages:
+        recorded = load_pages(args.pages)
+        pages = []
+        for rows in recorded:
+            newest = max((row[0] for row in rows), default=None)
+            if newest:
+                pages.append((datetime.datetime.strptime(newest, '%Y-%m-%d %H:%M:%S'), rows))
+        symbols = sorted({re.sub(r" ?Perpetual", "", row[1]).strip() for _, rows in pages for row in rows})
+    else:
+        pages = synthetic_pages(args.synthetic, args.rows_per_page, args.new_rows_per_page, symbols)
+
+    report = run(pages, args.latency_ms / 1000, args.workers, args.sample_every, symbols)
+    if args.json:
+        print(json.dumps(report, indent=4))
+        return
+    print(f"pages: {report['pages']}  rows: {report['rows']}  orders: {report['orders']}")
+    print(f"rows/sec: {report['rows_per_sec']}  end to end: {report['end_to_end_sec']}s")
+    print(f"memory: {report['memory_start_kb']} KB -> {report['memory_end_kb']} KB "
+          f"(growth {report['memory_growth_kb']} KB), dedup entries: {report['dedup_entries']}")
+    print(f"{'stage':<28}{'count':>8}{'p50 ms':>12}{'p99 ms':>12}")
+    for stage, values in report['stages'].items():
+        print(f"{stage:<28}{values['count']:>8}{values['p50_ms']:>12}{values['p99_ms']:>12}")
+
+
+if __name__ == '__main__':
+    main()
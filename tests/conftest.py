@@ -0,0 +1,38 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+from fakes import FakeClient  # noqa: E402
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(app, 'Client', lambda api_key, api_secret: client)
+    return client
+
+
+@pytest.fixture
+def filters(monkeypatch):
+    symbols = {
+        'BTCUSDT': app.SymbolFilters(0.001, 3, 0.001),
+        'ETHUSDT': app.SymbolFilters(0.01, 2, 0.01),
+        'DOGEUSDT': app.SymbolFilters(1.0, 0, 1.0),
+    }
+    monkeypatch.setattr(app.exchange_info_cache, 'symbols', symbols)
+    monkeypatch.setattr(app.exchange_info_cache, 'loaded_at', 0.0)
+    return symbols
+
+
+@pytest.fixture
+def follower(client, filters, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    follower = app.Follower('test', 'https://www.binance.com/en/copy-trading/lead-details/1', 'key', 'secret',
+                            1, 1000, 1000)
+    follower.running = True
+    yield follower
+    follower.stop()
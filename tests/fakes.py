@@ -0,0 +1,151 @@
+import threading
+import time
+
+import requests
+
+
+class FakeClient:
+    def __init__(self, symbols=('BTCUSDT', 'ETHUSDT', 'DOGEUSDT'), positions=()):
+        self.symbols = symbols
+        self.positions = list(positions)
+        self.session = requests.Session()
+        self.timestamp_offset = 0
+        self.orders = []
+        self.batches = []
+        self.batch_errors = {}
+        self.batch_exception = None
+        self.order_exception = None
+        self.lock = threading.Lock()
+
+    def futures_time(self):
+        return {'serverTime': int(time.time() * 1000)}
+
+    def futures_position_information(self):
+        return self.positions
+
+    def futures_exchange_info(self):
+        return {'symbols': [{
+            'symbol': symbol,
+            'filters': [
+                {'filterType': 'PRICE_FILTER', 'tickSize': '0.01'},
+                {'filterType': 'LOT_SIZE', 'stepSize': '0.001', 'minQty': '0.001'},
+                {'filterType': 'MIN_NOTIONAL', 'notional': '5'},
+            ],
+        } for symbol in self.symbols]}
+
+    def futures_create_order(self, **params):
+        if self.order_exception:
+            raise self.order_exception
+        with self.lock:
+            self.orders.append(params)
+        return {'symbol': params['symbol'], 'status': 'FILLED', 'origQty': str(params['quantity']),
+                'executedQty': str(params['quantity'])}
+
+    def futures_place_batch_order(self, **params):
+        if self.batch_exception:
+            raise self.batch_exception
+        with self.lock:
+            self.batches.append(params['batchOrders'])
+        results = []
+        for index, order in enumerate(params['batchOrders']):
+            if index in self.batch_errors:
+                results.append({'code': -2019, 'msg': self.batch_errors[index]})
+            else:
+                results.append({'symbol': order['symbol'], 'status': 'FILLED', 'origQty': order['quantity'],
+                                'executedQty': order['quantity']})
+        return results
+
+
+class FakeElement:
+    def __init__(self, driver, selector):
+        self.driver = driver
+        self.selector = selector
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def get_attribute(self, name):
+        last = self.driver.pages[self.driver.current_window_handle] >= self.driver.max_pages - 1
+        if 'pagination-next' not in self.selector:
+            return None
+        if name == 'class':
+            return 'bn-pagination-next disabled' if last else 'bn-pagination-next'
+        if name == 'aria-disabled':
+            return 'true' if last else 'false'
+        return None
+
+    def click(self):
+        self.driver.clicks.append(self.selector)
+        if 'pagination-next' in self.selector:
+            if self.driver.pages[self.driver.current_window_handle] < self.driver.max_pages - 1:
+                self.driver.pages[self.driver.current_window_handle] += 1
+        elif 'pagination-item' in self.selector:
+            self.driver.pages[self.driver.current_window_handle] = 0
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def new_window(self, kind):
+        handle = f"tab-{len(self.driver.pages)}"
+        self.driver.window_handles.append(handle)
+        self.driver.pages[handle] = 0
+        self.driver.current_window_handle = handle
+
+    def window(self, handle):
+        assert handle in self.driver.window_handles
+        self.driver.current_window_handle = handle
+
+
+class FakeDriver:
+    def __init__(self, navigate_failures=0, max_pages=3):
+        self.window_handles = ['blank']
+        self.current_window_handle = 'blank'
+        self.pages = {'blank': 0}
+        self.max_pages = max_pages
+        self.navigate_failures = navigate_failures
+        self.switch_to = FakeSwitchTo(self)
+        self.service = None
+        self.clicks = []
+        self.scripts = []
+        self.refreshes = 0
+        self.on_refresh = None
+        self.quit_called = False
+
+    def get(self, url):
+        self.pages[self.current_window_handle] = 0
+
+    def refresh(self):
+        self.refreshes += 1
+        self.navigate_failures = max(self.navigate_failures - 1, 0)
+        if self.on_refresh:
+            self.on_refresh()
+
+    def find_element(self, by, selector):
+        from selenium.common.exceptions import NoSuchElementException
+        if 'onetrust' in selector:
+            raise NoSuchElementException(selector)
+        if 'tradeHistory' in selector and self.navigate_failures:
+            raise NoSuchElementException(selector)
+        return FakeElement(self, selector)
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        page = self.pages.get(self.current_window_handle, 0)
+        if 'querySelectorAll' in script:
+            return [[f"{self.current_window_handle}-{page}"]]
+        if 'textContent : null' in script:
+            return f"{self.current_window_handle}-{page}"
+        if '__tradeRowsVersion || 0' in script:
+            return 0
+        return True
+
+    def close(self):
+        self.window_handles.remove(self.current_window_handle)
+
+    def quit(self):
+        self.quit_called = True
@@ -0,0 +1,133 @@
+import time
+
+import pytest
+import requests
+from binance.exceptions import BinanceAPIException
+
+import app
+
+
+def make_order(symbol, side='BUY', position_side='LONG', quantity=0.01):
+    return {'symbol': symbol, 'side': side, 'positionSide': position_side, 'type': 'MARKET',
+            'leverage': 1, 'quantity': quantity, 'row_time': time.time()}
+
+
+def test_batch_chunks_hold_one_order_per_symbol():
+    symbols = ['A', 'A', 'B', 'C', 'A', 'B', 'D', 'E', 'F', 'G']
+    orders = [make_order(symbol, quantity=index) for index, symbol in enumerate(symbols)]
+
+    chunks = app.batch_chunks(orders)
+
+    for chunk in chunks:
+        assert len(chunk) <= app.BATCH_ORDER_LIMIT
+        assert len({order['symbol'] for order in chunk}) == len(chunk)
+    assert sorted(order['quantity'] for chunk in chunks for order in chunk) == list(range(len(symbols)))
+    # Orders for one symbol land in later chunks in the order they came in.
+    for symbol in set(symbols):
+        placed = [order['quantity'] for chunk in chunks for order in chunk if order['symbol'] == symbol]
+        assert placed == sorted(placed)
+
+
+def test_batch_order_params_are_strings_without_leverage():
+    params = app.batch_order_params(make_order('BTCUSDT', quantity=0.5))
+
+    assert 'leverage' not in params and 'row_time' not in params
+    assert params['quantity'] == '0.5'
+    assert params['newOrderRespType'] == 'RESULT'
+
+
+def test_place_orders_sends_one_batch(follower, client):
+    follower.place_orders([make_order('BTCUSDT'), make_order('ETHUSDT'), make_order('DOGEUSDT', quantity=3)])
+
+    assert len(client.batches) == 1
+    assert [order['symbol'] for order in client.batches[0]] == ['BTCUSDT', 'ETHUSDT', 'DOGEUSDT']
+    assert client.orders == []
+    assert follower.positions.held('DOGEUSDT', 'LONG') == 3.0
+
+
+def test_place_orders_reports_per_order_errors(follower, client):
+    client.batch_errors = {1: 'Margin is insufficient.'}
+
+    follower.place_orders([make_order('BTCUSDT'), make_order('ETHUSDT')])
+
+    assert follower.positions.held('BTCUSDT', 'LONG') == 0.01
+    assert follower.positions.held('ETHUSDT', 'LONG') == 0.0
+    assert client.orders == []
+
+
+def test_single_order_skips_the_batch_endpoint(follower, client):
+    follower.place_orders([make_order('BTCUSDT'), make_order('BTCUSDT', side='SELL')])
+
+    assert client.batches == []
+    assert [order['side'] for order in client.orders] == ['BUY', 'SELL']
+
+
+def test_rejected_batch_falls_back_to_single_orders(follower, client):
+    client.batch_exception = BinanceAPIException(None, 400, '{"code": -1100, "msg": "Illegal characters."}')
+
+    follower.place_orders([make_order('BTCUSDT'), make_order('ETHUSDT')])
+
+    assert [order['symbol'] for order in client.orders] == ['BTCUSDT', 'ETHUSDT']
+    assert all('leverage' in order for order in client.orders)
+
+
+def test_batch_transport_error_is_not_resent(follower, client):
+    client.batch_exception = requests.ConnectionError('Connection reset by peer')
+
+    follower.place_orders([make_order('BTCUSDT'), make_order('ETHUSDT')])
+
+    assert client.orders == []
+    assert follower.positions.held('BTCUSDT', 'LONG') is None
+    assert follower.positions.held('ETHUSDT', 'LONG') is None
+
+
+@pytest.mark.parametrize('status_code, text', [
+    (503, '{"code": -1001, "msg": "Internal error; unable to process your request. Please try again."}'),
+    (400, '{"code": -1007, "msg": "Timeout waiting for response from backend server. Send status unknown."}'),
+])
+def test_batch_with_unknown_outcome_is_not_resent(follower, client, status_code, text):
+    client.batch_exception = BinanceAPIException(None, status_code, text)
+
+    follower.place_orders([make_order('BTCUSDT'), make_order('ETHUSDT')])
+
+    assert client.orders == []
+    assert follower.positions.held('BTCUSDT', 'LONG') is None
+    assert follower.positions.held('ETHUSDT', 'LONG') is None
+
+
+@pytest.mark.parametrize('status_code, text', [
+    (503, '{"code": -1001, "msg": "Internal error; unable to process your request. Please try again."}'),
+    (400, '{"code": -1007, "msg": "Timeout waiting for response from backend server. Send status unknown."}'),
+])
+def test_single_order_with_unknown_outcome_marks_the_position(follower, client, status_code, text):
+    client.order_exception = BinanceAPIException(None, status_code, text)
+
+    follower.place_orders([make_order('BTCUSDT')])
+
+    assert follower.positions.held('BTCUSDT', 'LONG') is None
+
+
+def test_rejected_single_order_keeps_the_position_known(follower, client):
+    client.order_exception = BinanceAPIException(None, 400, '{"code": -2019, "msg": "Margin is insufficient."}')
+
+    follower.place_orders([make_order('BTCUSDT')])
+
+    assert follower.positions.held('BTCUSDT', 'LONG') == 0.0
+
+
+def test_executor_counts_orders():
+    executor = app.OrderExecutor('test', workers=2)
+    placed = []
+    try:
+        executor.submit([make_order('BTCUSDT'), make_order('BTCUSDT', side='SELL'), make_order('ETHUSDT')],
+                        placed.extend)
+        deadline = time.monotonic() + 5
+        while executor.stats()['completed'] < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        executor.shutdown()
+
+    stats = executor.stats()
+    assert stats['submitted'] == stats['completed'] == 3
+    assert stats['queue_depth'] == 0
+    assert [order['side'] for order in placed if order['symbol'] == 'BTCUSDT'] == ['BUY', 'SELL']
@@ -0,0 +1,167 @@
+import threading
+import time
+
+import pytest
+
+import app
+from fakes import FakeDriver
+
+
+@pytest.fixture
+def drivers(monkeypatch):
+    drivers = []
+
+    def chrome(options=None):
+        driver = FakeDriver()
+        drivers.append(driver)
+        return driver
+
+    monkeypatch.setattr(app.webdriver, 'Chrome', chrome)
+    monkeypatch.setattr(app, 'PAGE_WAIT_TIMEOUT', 0.05)
+    return drivers
+
+
+@pytest.fixture
+def pool():
+    pool = app.BrowserPool(size=1)
+    yield pool
+    for slot in pool.slots:
+        slot.quit_driver()
+
+
+def open_sources(pool, count):
+    sources = [app.SeleniumSource(f"https://example.com/lead-details/{index}", pool=pool, observer=False)
+               for index in range(count)]
+    for source in sources:
+        source.open()
+    return sources
+
+
+def test_cycle_limit_is_per_tab_on_a_shared_browser(drivers, pool, monkeypatch):
+    monkeypatch.setattr(app, 'BROWSER_MAX_CYCLES', 3)
+    first, second = open_sources(pool, 2)
+    slot = pool.slots[0]
+
+    for _ in range(3):
+        first.record_cycle()
+        first.fetch_rows()
+    for _ in range(2):
+        second.record_cycle()
+        second.fetch_rows()
+    assert slot.recycles == 0
+
+    second.record_cycle()
+    second.fetch_rows()
+    assert slot.recycles == 1
+    assert drivers[0].quit_called
+    # Both tabs reopen in the fresh browser on their next use.
+    assert first.fetch_rows() and second.fetch_rows()
+    assert len(drivers) == 2
+
+
+def test_one_failing_tab_keeps_the_shared_browser(drivers, pool):
+    first, second = open_sources(pool, 2)
+    slot = pool.slots[0]
+
+    first.recycle()
+    assert slot.recycles == 0 and slot.driver is drivers[0]
+
+    first.record_cycle()
+    second.recycle()
+    assert slot.recycles == 0
+
+    first.recycle()
+    assert slot.recycles == 1 and slot.driver is None
+
+
+def test_navigation_retries_release_the_browser(drivers, pool, monkeypatch):
+    monkeypatch.setattr(app, 'PAGE_POLL_FREQUENCY', 0.2)
+    (other,) = open_sources(pool, 1)
+    driver = drivers[0]
+    driver.navigate_failures = 2
+    failed = threading.Event()
+    driver.on_refresh = failed.set
+    source = app.SeleniumSource('https://example.com/lead-details/slow', pool=pool, observer=False)
+    finished = {}
+
+    def open_slow_tab():
+        source.open()
+        finished['slow'] = time.monotonic()
+
+    thread = threading.Thread(target=open_slow_tab)
+    thread.start()
+    assert failed.wait(5)
+    other.fetch_rows()
+    finished['other'] = time.monotonic()
+    thread.join(5)
+
+    assert finished['other'] < finished['slow']
+    assert source.navigated and driver.refreshes == 2
+
+
+def test_navigation_gives_up_after_the_attempt_limit(drivers, pool, monkeypatch):
+    monkeypatch.setattr(app, 'NAVIGATE_ATTEMPTS', 2)
+    monkeypatch.setattr(app, 'PAGE_POLL_FREQUENCY', 0.01)
+    (source,) = open_sources(pool, 1)
+    drivers[0].navigate_failures = 5
+    source.navigated = False
+
+    with pytest.raises(Exception):
+        source.fetch_rows()
+    assert drivers[0].refreshes == 2
+
+
+def test_observer_is_reinstalled_after_refreshing_the_table(drivers, pool):
+    source = app.SeleniumSource('https://example.com/lead-details/1', pool=pool, observer=True)
+    source.open()
+    installs = drivers[0].scripts.count(app.TRADE_ROWS_OBSERVER_SCRIPT)
+
+    source.refresh()
+    assert drivers[0].scripts.count(app.TRADE_ROWS_OBSERVER_SCRIPT) == installs + 1
+    assert drivers[0].clicks[-1] == '#tab-tradeHistory > div'
+
+    source.next_page()
+    source.refresh()
+    assert drivers[0].scripts.count(app.TRADE_ROWS_OBSERVER_SCRIPT) == installs + 2
+
+
+def test_last_page_stops_the_pager(drivers, pool):
+    (source,) = open_sources(pool, 1)
+
+    assert source.has_next_page() and source.next_page()
+    assert source.has_next_page() and source.next_page()
+    assert not source.has_next_page()
+    assert not source.next_page()
+    assert source.current_page == 3
+
+
+def test_full_reload_once_the_interval_passes(drivers, pool, monkeypatch):
+    (source,) = open_sources(pool, 1)
+    driver = drivers[0]
+    gets = []
+    monkeypatch.setattr(driver, 'get', gets.append)
+
+    source.refresh()
+    assert gets == []
+
+    source.last_reload -= app.FULL_RELOAD_INTERVAL
+    source.refresh()
+    assert gets == [source.link]
+    assert time.monotonic() - source.last_reload < 1
+
+
+def test_rss_is_sampled_not_measured_on_every_lease(drivers, pool, monkeypatch):
+    (source,) = open_sources(pool, 1)
+    slot = pool.slots[0]
+    samples = []
+    monkeypatch.setattr(slot, 'rss_mb', lambda: samples.append(1) or 0.0)
+    slot.rss_checked_at = time.monotonic()
+
+    for _ in range(20):
+        source.fetch_rows()
+    assert samples == []
+
+    slot.rss_checked_at -= app.BROWSER_RSS_INTERVAL
+    source.fetch_rows()
+    source.fetch_rows()
+    assert samples == [1]
@@ -0,0 +1,30 @@
+import app
+
+
+def test_slow_client_is_dropped_and_its_stream_ends():
+    broker = app.EventBroker(buffer=2, keepalive=0.1)
+    fast = broker.subscribe()
+    slow = broker.subscribe()
+    stream = broker.stream(fast)
+    assert next(stream).startswith('retry:')
+
+    received = []
+    for index in range(3):
+        broker.deliver('row', {'index': index})
+        received.append(next(stream))
+
+    assert all('event: row' in message for message in received)
+    assert broker.dropped == 1
+    assert slow.get_nowait() is None
+    assert broker.clients == {fast}
+
+
+def test_streams_past_the_limit_are_refused(monkeypatch):
+    broker = app.EventBroker(max_clients=1)
+    monkeypatch.setattr(app, 'event_broker', broker)
+    assert broker.subscribe() is not None
+
+    response = app.app.test_client().get('/events')
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '30'
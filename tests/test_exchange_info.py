@@ -0,0 +1,45 @@
+import app
+from fakes import FakeClient
+
+
+class NoNetworkClient(FakeClient):
+    def __getattr__(self, name):
+        raise AssertionError(f"unexpected call to {name}")
+
+    def futures_exchange_info(self):
+        raise AssertionError('unexpected call to futures_exchange_info')
+
+
+def test_refresh_loads_futures_filters():
+    cache = app.ExchangeInfoCache()
+    cache.client = FakeClient(symbols=('BTCUSDT', '1000PEPEUSDT'))
+
+    assert cache.refresh()
+
+    assert cache.symbols['1000PEPEUSDT'] == app.SymbolFilters(0.001, 3, 0.001)
+    assert set(cache.symbols) == {'BTCUSDT', '1000PEPEUSDT'}
+
+
+def test_compile_filters_uses_the_larger_lot_minimum():
+    filters = app.ExchangeInfoCache.compile_filters({'symbol': 'DOGEUSDT', 'filters': [
+        {'filterType': 'LOT_SIZE', 'stepSize': '1', 'minQty': '1'},
+        {'filterType': 'MARKET_LOT_SIZE', 'stepSize': '1', 'minQty': '10'},
+        {'filterType': 'MIN_NOTIONAL', 'notional': '5'},
+    ]})
+
+    assert filters == app.SymbolFilters(1.0, 0, 10.0)
+
+
+def test_unknown_symbol_skips_only_its_row(follower, filters, monkeypatch):
+    monkeypatch.setattr(app.exchange_info_cache, 'client', NoNetworkClient())
+    monkeypatch.setattr(app.exchange_info_cache, 'wake', app.threading.Event())
+    rows = [
+        ({'Symbol': 'BTCUSDT', 'Side': 'Open Long', 'Quantity': 1.0, 'Realized Profit': 0.0}, 0.0),
+        ({'Symbol': '1000PEPEUSDT', 'Side': 'Open Long', 'Quantity': 1.0, 'Realized Profit': 0.0}, 0.0),
+        ({'Symbol': 'ETHUSDT', 'Side': 'Open Short', 'Quantity': 1.0, 'Realized Profit': 0.0}, 0.0),
+    ]
+
+    orders = follower.size_orders(rows)
+
+    assert [order['symbol'] for order in orders] == ['BTCUSDT', 'ETHUSDT']
+    assert app.exchange_info_cache.wake.is_set()
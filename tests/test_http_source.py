@@ -0,0 +1,83 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import app
+
+LINK = 'https://www.binance.com/en/copy-trading/lead-details/3871235436429843712?timeRange=30D'
+
+
+def make_trade(index):
+    return {'time': 1718358087000 - index * 1000, 'symbol': 'BTCUSDT', 'side': 'SELL', 'positionSide': 'LONG',
+            'price': 66912.3, 'qty': 0.125, 'realizedProfit': 1204.55 - index}
+
+
+@pytest.fixture
+def stub():
+    trades = [make_trade(index) for index in range(5)]
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            requests_seen.append(body)
+            start = (body['pageNumber'] - 1) * body['pageSize']
+            payload = json.dumps({'code': '000000', 'data': {
+                'total': len(trades), 'list': trades[start:start + body['pageSize']]}}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/trade-history", requests_seen
+    server.shutdown()
+    server.server_close()
+
+
+def test_trade_to_cells_matches_the_table_format():
+    cells = app.HttpSource.trade_to_cells({'time': 1718358087000, 'symbol': '1000PEPEUSDT', 'side': 'BUY',
+                                           'positionSide': 'SHORT', 'price': 1.2e-05, 'qty': 1250000,
+                                           'realizedProfit': -87.1})
+
+    assert cells[1:] == ['1000PEPEUSDT', 'Close Short', '0.000012', '1250000', '-87.1']
+    assert len(cells[0]) == len('2024-06-14 09:41:27')
+
+
+def test_pages_through_the_stub(stub):
+    url, requests_seen = stub
+    source = app.HttpSource(LINK, url=url, page_size=2)
+
+    pages = [source.fetch_rows()]
+    while source.has_next_page():
+        source.next_page()
+        pages.append(source.fetch_rows())
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [body['pageNumber'] for body in requests_seen] == [1, 2, 3]
+    assert {body['portfolioId'] for body in requests_seen} == {'3871235436429843712'}
+    assert pages[0][0] == app.HttpSource.trade_to_cells(make_trade(0))
+
+    source.refresh()
+    assert source.current_page == 1
+
+
+def test_link_without_portfolio_id_is_rejected():
+    with pytest.raises(ValueError):
+        app.HttpSource('https://www.binance.com/en/copy-trading')
+
+    response = app.app.test_client().post('/start', json={
+        'task_id': 'bad-link', 'link': 'https://www.binance.com/en/copy-trading', 'api_key': 'key',
+        'api_secret': 'secret', 'leverage': 1, 'trader_portfolio_size': 1000, 'your_portfolio_size': 1000,
+        'source': 'http'})
+
+    assert response.status_code == 400
+    assert 'bad-link' not in app.running_scrapers
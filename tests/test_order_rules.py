@@ -0,0 +1,210 @@
+import random
+
+import app
+
+LABELS = ['Open Long', 'Close Long', 'Open Short', 'Close Short', 'Buy/Long', 'Sell/Short', 'Unknown']
+FILTERS = {
+    'BTCUSDT': app.SymbolFilters(0.001, 3, 0.001),
+    'ETHUSDT': app.SymbolFilters(0.01, 2, 0.0),
+    'DOGEUSDT': app.SymbolFilters(1.0, 0, 5.0),
+}
+POSITION_STATES = [
+    None,
+    {},
+    {('BTCUSDT', 'LONG'): 0.5, ('DOGEUSDT', 'SHORT'): 40.0, ('ETHUSDT', 'LONG'): 0.0},
+]
+
+
+def adjust_quantity(filters, symbol, quantity):
+    symbol_filters = filters[symbol]
+    quantity = round(quantity, symbol_filters.precision)
+    if quantity < symbol_filters.min_quantity:
+        quantity = symbol_filters.min_quantity
+    return quantity
+
+
+class StaticBook:
+    def __init__(self, positions):
+        self.positions = positions
+
+    def held(self, symbol, position_side):
+        if self.positions is None:
+            return None
+        return self.positions.get((symbol, position_side), 0.0)
+
+
+class LegacySizing:
+    # The per-row branches the rule table replaced, kept verbatim as the reference.
+    def __init__(self, filters, positions, leverage, your_portfolio_size, trader_portfolio_size,
+                 close_only_mode, reverse_copy):
+        self.filters = filters
+        self.positions = positions
+        self.leverage = leverage
+        self.your_portfolio_size = your_portfolio_size
+        self.trader_portfolio_size = trader_portfolio_size
+        self.close_only_mode = close_only_mode
+        self.reverse_copy = reverse_copy
+
+    def close_quantity(self, symbol, position_side, quantity):
+        # Cap a close at the position we hold, so the 1.05 headroom can't overshoot it. Without a known position
+        # the fixed rule is kept.
+        held = self.positions.held(symbol, position_side) if self.positions else None
+        if held == 0.0:
+            return 0.0
+        if held is not None:
+            quantity = min(quantity, held)
+        return adjust_quantity(self.filters, symbol, quantity)
+
+    def build_orders(self, symbol, side, quantity, realized_profit):
+        orders = []
+        if side in ['Open Long', 'Buy/Long'] and realized_profit == 0.0:
+            quantity = float(quantity)
+            quantity = (quantity * float(self.your_portfolio_size)) / float(self.trader_portfolio_size)
+            side = 'BUY'
+            position_side = 'LONG'
+            quantity = adjust_quantity(self.filters, symbol, quantity)
+            orders.append({'symbol': symbol,
+                           'side': side,
+                           'positionSide': position_side,
+                           'type': 'MARKET',
+                           'leverage': int(self.leverage),
+                           'quantity': quantity})
+
+        elif side in ['Close Long', 'Sell/Short'] and realized_profit != 0.0:
+            quantity = float(quantity)
+            quantity = ((quantity * float(self.your_portfolio_size)) / float(self.trader_portfolio_size)) * 1.05
+            side = 'SELL'
+            position_side = 'LONG'
+            quantity = self.close_quantity(symbol, position_side, quantity)
+            orders.append({'symbol': symbol,
+                           'side': side,
+                           'positionSide': position_side,
+                           'type': 'MARKET',
+                           'leverage': int(self.leverage),
+                           'quantity': quantity})
+
+        elif side in ['Open Short', 'Sell/Short'] and realized_profit == 0.0:
+            side = 'SELL'
+            position_side = 'SHORT'
+            quantity = float(quantity)
+            quantity = (quantity * float(self.your_portfolio_size)) / float(self.trader_portfolio_size)
+            quantity = adjust_quantity(self.filters, symbol, quantity)
+            orders.append({'symbol': symbol,
+                           'side': side,
+                           'positionSide': position_side,
+                           'type': 'MARKET',
+                           'leverage': int(self.leverage),
+                           'quantity': quantity})
+
+        elif side in ['Close Short', 'Buy/Long'] and realized_profit != 0.0:
+            quantity = float(quantity)
+            quantity = ((quantity * float(self.your_portfolio_size)) / float(self.trader_portfolio_size)) * 1.05
+            side = 'BUY'
+            position_side = 'SHORT'
+            quantity = self.close_quantity(symbol, position_side, quantity)
+            orders.append({'symbol': symbol,
+                           'side': side,
+                           'positionSide': position_side,
+                           'type': 'MARKET',
+                           'leverage': int(self.leverage),
+                           'quantity': quantity})
+        if self.close_only_mode:
+            if side in ['Open Long', 'Buy/Long'] and realized_profit == 0.0:
+                return orders  # Ignore this order in close only mode
+            if side in ['Close Long', 'Sell/Short'] and realized_profit != 0.0:
+                return orders  # Ignore this order in close only mode
+
+        if self.reverse_copy:
+            if side in ['Open Long', 'Buy/Long'] and realized_profit == 0.0:
+                side = 'SELL'
+                position_side = 'SHORT'
+                quantity = float(quantity)
+                quantity = ((quantity * float(self.your_portfolio_size)) / float(self.trader_portfolio_size)) * 1.05
+                quantity = adjust_quantity(self.filters, symbol, quantity)
+                orders.append({'symbol': symbol,
+                               'side': side,
+                               'positionSide': position_side,
+                               'type': 'MARKET',
+                               'leverage': int(self.leverage),
+                               'quantity': quantity})
+
+            elif side in ['Close Long', 'Sell/Short'] and realized_profit != 0.0:
+                side = 'BUY'
+                position_side = 'SHORT'
+                quantity = float(quantity)
+                quantity = (quantity * float(self.your_portfolio_size)) / float(self.trader_portfolio_size)
+                quantity = adjust_quantity(self.filters, symbol, quantity)
+                orders.append({'symbol': symbol,
+                               'side': side,
+                               'positionSide': position_side,
+                               'type': 'MARKET',
+                               'leverage': int(self.leverage),
+                               'quantity': quantity})
+
+            elif side in ['Open Short', 'Buy/Long'] and realized_profit == 0.0:
+                side = 'BUY'
+                position_side = 'LONG'
+                quantity = float(quantity)
+                quantity = ((quantity * float(self.your_portfolio_size)) / float(self.trader_portfolio_size)) * 1.05
+                quantity = adjust_quantity(self.filters, symbol, quantity)
+                orders.append({'symbol': symbol,
+                               'side': side,
+                               'positionSide': position_side,
+                               'type': 'MARKET',
+                               'leverage': int(self.leverage),
+                               'quantity': quantity})
+            elif side in ['Close Short', 'Buy/Long'] and realized_profit != 0.0:
+                side = 'SELL'
+                position_side = 'LONG'
+                quantity = float(quantity)
+                quantity = (quantity * float(self.your_portfolio_size)) / float(self.trader_portfolio_size)
+                quantity = adjust_quantity(self.filters, symbol, quantity)
+                orders.append({'symbol': symbol,
+                               'side': side,
+                               'positionSide': position_side,
+                               'type': 'MARKET',
+                               'leverage': int(self.leverage),
+                               'quantity': quantity})
+        return orders
+
+
+def make_follower(positions, leverage, your_portfolio_size, trader_portfolio_size, close_only_mode, reverse_copy):
+    follower = app.Follower.__new__(app.Follower)
+    follower.metrics = app.TaskMetrics(app.ORDER_STAGES)
+    follower.positions = positions
+    follower.leverage = leverage
+    follower.your_portfolio_size = your_portfolio_size
+    follower.trader_portfolio_size = trader_portfolio_size
+    follower.close_only_mode = close_only_mode
+    follower.reverse_copy = reverse_copy
+    return follower
+
+
+def test_rule_table_matches_the_legacy_branches(monkeypatch):
+    monkeypatch.setattr(app.exchange_info_cache, 'symbols', dict(FILTERS))
+    rng = random.Random(17)
+    for _ in range(20000):
+        positions = StaticBook(rng.choice(POSITION_STATES))
+        settings = (rng.choice(['1', 3, '20']), rng.choice([100, '250.5', 1000, 33]),
+                    rng.choice([1000, '77', 5000, 12345.6]), rng.random() < 0.5, rng.random() < 0.5)
+        row = {
+            'Symbol': rng.choice(list(FILTERS)),
+            'Side': rng.choice(LABELS),
+            'Quantity': round(rng.uniform(0, 50), rng.randint(0, 4)),
+            'Realized Profit': rng.choice([0.0, -0.0, 1.5, -3.0]),
+        }
+
+        legacy = LegacySizing(FILTERS, positions, *settings)
+        expected = [order for order in legacy.build_orders(row['Symbol'], row['Side'], row['Quantity'],
+                                                             row['Realized Profit'])
+                    if order['quantity']]
+        follower = make_follower(positions, *settings)
+        sized = [{key: value for key, value in order.items() if key != 'row_time'}
+                 for order in follower.size_orders([(row, 0.0)])]
+
+        assert sized == expected, (row, settings, positions.positions)
+
+
+def test_flags_do_not_change_decisions():
+    for (label, pnl_nonzero, close_only, reverse), rule in app.ORDER_RULES.items():
+        assert rule == app.ORDER_RULES[(label, pnl_nonzero, False, False)]
@@ -0,0 +1,74 @@
+import os
+import re
+
+import pytest
+from bs4 import BeautifulSoup
+
+import app
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def legacy_parse(html):
+    # The BeautifulSoup loop that scrape_and_display_orders used before rows were extracted in one pass.
+    orders = []
+    soup = BeautifulSoup(html, 'html.parser')
+    for order in soup.select(".css-g5h8k8 > div > div > div > table > tbody > tr"):
+        time_str = order.select_one("td:nth-child(1)").text.strip()
+        symbol = order.select_one("td:nth-child(2)").text.strip()
+        side = order.select_one("td:nth-child(3)").text.strip()
+        price_str = order.select_one("td:nth-child(4)").text.strip()
+        quantity_str = order.select_one("td:nth-child(5)").text.strip()
+        realized_profit_str = order.select_one("td:nth-child(6)").text.strip()
+
+        price = float(re.sub(r'[^\d.]', '', price_str.replace(',', '')))
+        quantity_str = quantity_str.split(' ', 1)[0].replace(',', '')
+        quantity = float(quantity_str)
+        realized_profit_str = realized_profit_str.replace('USDT', '').strip()
+        realized_profit = float(realized_profit_str.replace(',', ''))
+
+        symbol = re.sub(r" ?Perpetual", "", symbol).strip()
+        orders.append({
+            "Time": time_str,
+            "Symbol": symbol,
+            "Side": side,
+            "Price": price,
+            "Quantity": quantity,
+            "Realized Profit": realized_profit
+        })
+    return orders
+
+
+@pytest.fixture(params=['lxml', 'html.parser'])
+def parser(request, monkeypatch):
+    monkeypatch.setattr(app, 'HTML_PARSER', request.param)
+    return request.param
+
+
+@pytest.fixture
+def task(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    return app.ScrapeTask('https://www.binance.com/en/copy-trading/lead-details/1')
+
+
+@pytest.mark.parametrize('name', ['trade_history.html', 'trade_history_empty.html'])
+def test_rows_match_the_legacy_loop(name, parser, task):
+    html = fixture(name)
+
+    parsed = [task.parse_trade_row(cells) for cells in app.parse_trade_rows_html(html)]
+
+    assert parsed == legacy_parse(html)
+
+
+def test_fixture_rows(parser, task):
+    rows = app.parse_trade_rows_html(fixture('trade_history.html'))
+
+    assert len(rows) == 5
+    assert rows[1] == ['2024-06-14 09:40:02', 'ETHUSDT Perpetual', 'Open Short', '3,481.07', '2.5 ETH', '0.00 USDT']
+    assert task.parse_trade_row(rows[2])['Symbol'] == '1000PEPEUSDT'
+    assert task.parse_trade_row(rows[4])['Price'] == 158.4
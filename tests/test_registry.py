@@ -0,0 +1,194 @@
+import time
+from contextlib import contextmanager
+
+import fakeredis
+import pytest
+import redis
+
+import app
+
+LINK_A = 'https://www.binance.com/en/copy-trading/lead-details/1'
+LINK_B = 'https://www.binance.com/en/copy-trading/lead-details/2'
+
+
+class StubSummary:
+    def summary(self):
+        return [{"Symbol": "BTCUSDT", "Side": "Open Long", "Quantity": 0.002}]
+
+
+class StubFollower:
+    def __init__(self, task_id, link):
+        self.task_id = task_id
+        self.link = link
+        self.running = True
+        self.order_summary = StubSummary()
+
+
+def launch_task(task_id, config):
+    follower = StubFollower(task_id, config['link'])
+    app.running_scrapers[task_id] = follower
+    app.trader_scrapers.setdefault(config['link'], object())
+    return follower
+
+
+def stop_task(task_id):
+    follower = app.running_scrapers.pop(task_id, None)
+    if follower and not any(other.link == follower.link for other in app.running_scrapers.values()):
+        app.trader_scrapers.pop(follower.link, None)
+    return follower
+
+
+class Worker:
+    def __init__(self, redis_client, worker_id, lease_seconds=30, interval=1):
+        self.registry = app.TaskRegistry(redis_client, worker_id, lease_seconds=lease_seconds, interval=interval)
+        self.running_scrapers = {}
+        self.trader_scrapers = {}
+
+    @contextmanager
+    def local_state(self):
+        # Each worker is its own process in production; swap in this worker's task tables.
+        saved = app.running_scrapers, app.trader_scrapers
+        app.running_scrapers, app.trader_scrapers = self.running_scrapers, self.trader_scrapers
+        try:
+            yield
+        finally:
+            app.running_scrapers, app.trader_scrapers = saved
+
+    def sync(self):
+        with self.local_state():
+            self.registry.sync()
+
+    def run_once(self):
+        with self.local_state():
+            self.registry.run_once()
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(app, 'launch_task', launch_task)
+    monkeypatch.setattr(app, 'stop_task', stop_task)
+    monkeypatch.setattr(app, 'task_status', lambda task_id, follower: {"task_id": task_id, "link": follower.link})
+    return fakeredis.FakeServer()
+
+
+def connect(server):
+    return fakeredis.FakeRedis(server=server, decode_responses=True)
+
+
+def add_tasks(registry):
+    registry.add('a1', {'link': LINK_A})
+    registry.add('a2', {'link': LINK_A})
+    registry.add('b1', {'link': LINK_B})
+
+
+def test_claim_takes_each_trader_once(server):
+    first = Worker(connect(server), 'first')
+    second = Worker(connect(server), 'second')
+    add_tasks(first.registry)
+
+    first.sync()
+
+    assert sorted(first.running_scrapers) == ['a1', 'a2', 'b1']
+    assert sorted(first.trader_scrapers) == [LINK_A, LINK_B]
+    assert connect(server).get(first.registry.lease_key(LINK_A)) == 'first'
+    assert not second.registry.claim(LINK_A)
+
+
+def test_renew_extends_only_owned_leases(server):
+    first = Worker(connect(server), 'first', lease_seconds=5)
+    second = Worker(connect(server), 'second', lease_seconds=5)
+    add_tasks(first.registry)
+    first.sync()
+    client = connect(server)
+    client.expire(first.registry.lease_key(LINK_A), 1)
+
+    assert first.registry.renew(LINK_A)
+    assert client.ttl(first.registry.lease_key(LINK_A)) > 1
+    assert not second.registry.renew(LINK_A)
+
+
+def test_removed_task_stops_but_trader_keeps_its_other_followers(server):
+    first = Worker(connect(server), 'first')
+    add_tasks(first.registry)
+    first.sync()
+
+    first.registry.remove('a1')
+    first.sync()
+
+    assert sorted(first.running_scrapers) == ['a2', 'b1']
+    assert LINK_A in first.trader_scrapers
+
+
+def test_over_share_worker_hands_a_trader_back(server):
+    first = Worker(connect(server), 'first')
+    second = Worker(connect(server), 'second')
+    add_tasks(first.registry)
+    first.sync()
+
+    second.sync()
+    assert second.trader_scrapers == {}
+    first.sync()
+    second.sync()
+
+    assert len(first.trader_scrapers) == 1
+    assert len(second.trader_scrapers) == 1
+    # Followers of one trader always move together.
+    for worker in (first, second):
+        links = {follower.link for follower in worker.running_scrapers.values()}
+        assert links == set(worker.trader_scrapers)
+
+
+def test_live_worker_takes_over_after_a_worker_dies(server):
+    first = Worker(connect(server), 'first', lease_seconds=1)
+    second = Worker(connect(server), 'second', lease_seconds=1)
+    add_tasks(first.registry)
+    first.sync()
+    second.sync()
+
+    time.sleep(1.2)
+    second.sync()
+
+    assert sorted(second.running_scrapers) == ['a1', 'a2', 'b1']
+    assert connect(server).hkeys(second.registry.workers_key) == ['second']
+
+
+def test_other_workers_tasks_are_answered_from_the_registry(server, monkeypatch):
+    first = Worker(connect(server), 'first')
+    second = Worker(connect(server), 'second')
+    add_tasks(first.registry)
+    first.sync()
+    monkeypatch.setattr(app, 'task_registry', second.registry)
+    web = app.app.test_client()
+
+    with second.local_state():
+        summary = web.get('/summary/a1')
+        journal = web.get('/journal/a1')
+        missing = web.get('/summary/nope')
+
+    assert summary.status_code == 200
+    assert summary.get_json() == StubSummary().summary()
+    assert journal.status_code == 409
+    assert journal.get_json()['worker'] == 'first'
+    assert missing.status_code == 404
+
+
+class UnreachableRedis:
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise redis.ConnectionError('Connection refused')
+        return fail
+
+
+def test_unreachable_redis_stops_tasks_before_the_lease_expires(server):
+    first = Worker(connect(server), 'first', lease_seconds=1, interval=0.5)
+    add_tasks(first.registry)
+    first.sync()
+
+    first.registry.redis = UnreachableRedis()
+    first.run_once()
+    assert sorted(first.running_scrapers) == ['a1', 'a2', 'b1']
+
+    time.sleep(0.6)
+    first.run_once()
+    assert first.running_scrapers == {}
+    assert first.trader_scrapers == {}
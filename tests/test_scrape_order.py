@@ -0,0 +1,117 @@
+import datetime
+
+import app
+
+
+class PagedSource:
+    pool_slot = None
+
+    def __init__(self, task, pages):
+        self.task = task
+        self.pages = pages
+        self.current_page = 1
+
+    def fetch_rows(self):
+        return self.pages[self.current_page - 1]
+
+    def has_next_page(self):
+        return self.current_page < len(self.pages)
+
+    def next_page(self):
+        if self.current_page == len(self.pages):
+            return False
+        self.current_page += 1
+        return True
+
+    def wait_for_change(self, timeout):
+        self.task.running = False
+        return True
+
+    def refresh(self):
+        self.current_page = 1
+
+    def rss_mb(self):
+        return 0.0
+
+    def record_cycle(self):
+        pass
+
+    def recycle(self):
+        pass
+
+
+class RecordingFollower:
+    task_id = 'recorder'
+
+    def __init__(self, directory):
+        self.copied = []
+        self.journal = app.TradeJournal('recorder', directory=str(directory))
+
+    def copy_orders(self, detected):
+        self.copied.extend(order_data['Side'] for order_data, row_time in detected)
+
+
+def row(seconds_ago, side, pnl):
+    when = datetime.datetime.now() - datetime.timedelta(seconds=seconds_ago)
+    return [when.strftime('%Y-%m-%d %H:%M:%S'), 'BTCUSDT Perpetual', side, '65,000.10', '0.002 BTC', f'{pnl} USDT']
+
+
+class StuckPagerSource(PagedSource):
+    # The last page still shows an enabled "next" button that does nothing.
+    def has_next_page(self):
+        return True
+
+
+def run_cycle(pages, directory, source=PagedSource):
+    task = app.ScrapeTask('https://www.binance.com/en/copy-trading/lead-details/1')
+    follower = RecordingFollower(directory)
+    task.subscribe(follower)
+    task.source = source(task, pages)
+    task.running = True
+    task.scrape_and_display_orders()
+    return follower.copied
+
+
+def test_rows_are_copied_oldest_first(tmp_path):
+    pages = [[row(1, 'Close Short', '-1.50'), row(5, 'Open Short', '0.00')]]
+    assert run_cycle(pages, tmp_path) == ['Open Short', 'Close Short']
+
+
+def test_rows_across_pages_are_copied_oldest_first(tmp_path):
+    pages = [
+        [row(1, 'Close Long', '2.00'), row(2, 'Open Long', '0.00')],
+        [row(3, 'Close Short', '-1.50'), row(4, 'Open Short', '0.00')],
+    ]
+    assert run_cycle(pages, tmp_path) == ['Open Short', 'Close Short', 'Open Long', 'Close Long']
+
+
+def test_cycle_ends_when_next_page_does_nothing(tmp_path):
+    pages = [
+        [row(1, 'Close Long', '2.00'), row(2, 'Open Long', '0.00')],
+        [row(3, 'Close Short', '-1.50')],
+    ]
+    assert run_cycle(pages, tmp_path, StuckPagerSource) == ['Close Short', 'Open Long', 'Close Long']
+
+
+class ClosingScrapeTask(app.ScrapeTask):
+    # The supervisor closes the source between two reads of the attribute.
+    reads = 0
+
+    @property
+    def source(self):
+        self.reads += 1
+        return PagedSource(self, []) if self.reads == 1 else None
+
+    @source.setter
+    def source(self, value):
+        pass
+
+
+def test_status_survives_the_source_closing(follower):
+    scraper = ClosingScrapeTask(follower.link)
+    scraper.subscribe(follower)
+
+    status = app.task_status('test', follower)
+
+    assert status['pool_slot'] is None
+    assert status['supervisor']['browser_recycles'] == 0